@@ -1,4 +1,5 @@
 from .fair_price_estimation import fair_price_estimation
 from .plot_yearly_financials import plot_yearly_financials
 from .plot_quarterly_financials import plot_quarterly_financials
-from .analyze_company import analyze_company
\ No newline at end of file
+from .analyze_company import analyze_company
+from .company_bundle import CompanyBundle, load_company_bundle
\ No newline at end of file
@@ -3,6 +3,7 @@ from .plot_yearly_financials import plot_yearly_financials
 from .plot_quarterly_financials import plot_quarterly_financials
 from .fair_price_estimation import fair_price_estimation
 from .plot_closing_price import plot_closing_price
+from .company_bundle import load_company_bundle
 
 def analyze_company():
     st.subheader("Analysis of the selected company")
@@ -29,21 +30,28 @@ def analyze_company():
             st.warning("Please enter a valid company ticker.")
             return
 
+        # Fetch all company data once (or reuse the cached bundle) for every section below
+        try:
+            bundle = load_company_bundle(ticker)
+        except Exception as e:
+            st.error(f"An error occurred while fetching data for {ticker}: {e}")
+            return
+
         # 1. Stock price chart
         st.write(f"**Stock price chart for {ticker}:**")
-        plot_closing_price(ticker)
+        plot_closing_price(ticker, bundle)
 
         # 2. Annual financial data
         st.write(f"**Annual financial data for {ticker}:**")
-        plot_yearly_financials(ticker)
+        plot_yearly_financials(ticker, bundle)
 
         # 3. Quarterly financial data
         st.write(f"**Quarterly financial data for {ticker}:**")
-        plot_quarterly_financials(ticker)
+        plot_quarterly_financials(ticker, bundle)
 
         # 4. Key metrics and fair value calculations
         st.write("**Key metrics and fair value calculations:**")
-        results = fair_price_estimation(ticker)
+        results = fair_price_estimation(ticker, bundle)
 
         # -- Split the screen into two columns --
         col1, col2 = st.columns(2)
@@ -0,0 +1,92 @@
+from .imports import *
+import os
+import time
+import pickle
+import tempfile
+
+# Time (in seconds) after which a cached bundle is fetched again
+DEFAULT_TTL = int(os.environ.get("COMPANY_CACHE_TTL", 6 * 60 * 60))
+DEFAULT_CACHE_DIR = os.environ.get("COMPANY_CACHE_DIR", os.path.join(".cache", "companies"))
+
+_memory_cache = {}
+
+
+class CompanyBundle:
+    """All data needed to analyze one company, fetched from the provider once."""
+    def __init__(self, ticker, history, info, financials, quarterly_financials,
+                 balance_sheet, cashflow, fetched_at=None):
+        self.ticker = ticker
+        self.history = history
+        self.info = info
+        self.financials = financials
+        self.quarterly_financials = quarterly_financials
+        self.balance_sheet = balance_sheet
+        self.cashflow = cashflow
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+
+    @classmethod
+    def fetch(cls, ticker):
+        """Downloads history, info and all statements for the ticker."""
+        provider = get_provider()
+        return cls(
+            ticker=ticker,
+            history=provider.history(ticker, period="max"),
+            info=provider.info(ticker),
+            financials=provider.financials(ticker),
+            quarterly_financials=provider.quarterly_financials(ticker),
+            balance_sheet=provider.balance_sheet(ticker),
+            cashflow=provider.cashflow(ticker),
+        )
+
+    def is_fresh(self, ttl):
+        return time.time() - self.fetched_at < ttl
+
+
+def _bundle_path(ticker, cache_dir):
+    return os.path.join(cache_dir, f"{ticker.upper()}.pkl")
+
+
+def _read_bundle(path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def _write_bundle(bundle, path):
+    """Writes the bundle atomically so concurrent readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_company_bundle(ticker, ttl=DEFAULT_TTL, cache_dir=DEFAULT_CACHE_DIR, force_refresh=False):
+    """
+    Returns the CompanyBundle for the ticker, checking the in-memory cache,
+    then the disk cache, and downloading only when both are missing or older than 'ttl' seconds.
+    """
+    key = ticker.upper()
+    path = _bundle_path(ticker, cache_dir)
+
+    if not force_refresh:
+        bundle = _memory_cache.get(key)
+        if bundle is not None and bundle.is_fresh(ttl):
+            return bundle
+
+        bundle = _read_bundle(path) if os.path.exists(path) else None
+        if bundle is not None and bundle.is_fresh(ttl):
+            _memory_cache[key] = bundle
+            return bundle
+
+    bundle = CompanyBundle.fetch(ticker)
+    _memory_cache[key] = bundle
+    _write_bundle(bundle, path)
+    return bundle
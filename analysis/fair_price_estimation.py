@@ -1,15 +1,16 @@
 from .imports import *
-import yfinance as yf
+from .company_bundle import load_company_bundle
 import pandas as pd
 
-def fetch_financial_data(ticker):
-    stock = yf.Ticker(ticker)
+def fetch_financial_data(ticker, bundle=None):
+    if bundle is None:
+        bundle = load_company_bundle(ticker)
     return {
-        "info": stock.info,
-        "financials": stock.financials,
-        "balance_sheet": stock.balance_sheet,
-        "cashflow": stock.cashflow,
-        "history": stock.history(period="1d"),
+        "info": bundle.info,
+        "financials": bundle.financials,
+        "balance_sheet": bundle.balance_sheet,
+        "cashflow": bundle.cashflow,
+        "history": bundle.history.tail(1),
     }
 
 def extract_key_metrics(data):
@@ -155,8 +156,8 @@ def calculate_fair_values(metrics, ratios):
         "fair_price_average": fair_price_average,
     }
 
-def fair_price_estimation(ticker):
-    data = fetch_financial_data(ticker)
+def fair_price_estimation(ticker, bundle=None):
+    data = fetch_financial_data(ticker, bundle)
     metrics = extract_key_metrics(data)
     ratios = calculate_ratios(metrics)
     fair_values = calculate_fair_values(metrics, ratios)
@@ -1,4 +1,4 @@
 import streamlit as st
-import yfinance as yf
+from market_data import get_provider
 import pandas as pd
 import plotly.graph_objects as go
\ No newline at end of file
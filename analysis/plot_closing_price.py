@@ -1,12 +1,14 @@
 from .imports import *
-import yfinance as yf
+from .company_bundle import load_company_bundle
 import plotly.graph_objects as go
 
-def plot_closing_price(ticker):
+def plot_closing_price(ticker, bundle=None):
     """Fetch and plot the closing price of the selected company's stock."""
     try:
-        # Fetch the maximum historical data for the ticker
-        data = yf.Ticker(ticker).history(period="max")
+        # Maximum historical data for the ticker (shared through the company bundle)
+        if bundle is None:
+            bundle = load_company_bundle(ticker)
+        data = bundle.history.copy()
         if data.empty:
             st.warning(f"Could not fetch data for {ticker}. Please check the ticker and try again.")
             return
@@ -1,15 +1,15 @@
 from .imports import *
-import yfinance as yf
+from .company_bundle import load_company_bundle
 import plotly.graph_objects as go
 
-def plot_quarterly_financials(ticker):
+def plot_quarterly_financials(ticker, bundle=None):
     """Displays quarterly financial data charts in Streamlit."""
-    stock = yf.Ticker(ticker)
-
     try:
-        financials_quarterly = stock.quarterly_financials
+        if bundle is None:
+            bundle = load_company_bundle(ticker)
+        financials_quarterly = bundle.quarterly_financials
     except:
-        st.write("No quarterly financial data available in yfinance.")
+        st.write("No quarterly financial data available from the data provider.")
         return
 
     def safe_loc(df, row):
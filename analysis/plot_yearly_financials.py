@@ -1,15 +1,15 @@
 from .imports import *
-import yfinance as yf
+from .company_bundle import load_company_bundle
 import plotly.graph_objects as go
 
-def plot_yearly_financials(ticker):
+def plot_yearly_financials(ticker, bundle=None):
     """Displays yearly financial data charts in Streamlit."""
-    stock = yf.Ticker(ticker)
-
     try:
-        financials_yearly = stock.financials
+        if bundle is None:
+            bundle = load_company_bundle(ticker)
+        financials_yearly = bundle.financials
     except:
-        st.write("No yearly financial data available in yfinance.")
+        st.write("No yearly financial data available from the data provider.")
         return
 
     def safe_loc(df, row):
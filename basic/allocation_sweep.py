@@ -0,0 +1,109 @@
+from .imports import *
+from .simulation_engine import growth_simulation_inputs, simulate_batch, ASSET_LABELS
+import os
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+
+# Dane współdzielone przez procesy robocze (ustawiane raz w inicjalizatorze puli)
+_shared_inputs = None
+
+
+def allocation_grid(n_parts, step=5):
+    """
+    Wszystkie podziały 100% na n_parts udziałów z krokiem 'step' (%)
+    jako tablica ułamków (N, n_parts) - metoda "gwiazdek i kresek".
+    """
+    units = 100 // step
+    cuts = np.array(list(combinations(range(units + n_parts - 1), n_parts - 1)), dtype=np.int64)
+    cuts = cuts.reshape(-1, n_parts - 1)
+    bounds = np.hstack([
+        np.full((len(cuts), 1), -1),
+        cuts,
+        np.full((len(cuts), 1), units + n_parts - 1)
+    ])
+    return (np.diff(bounds, axis=1) - 1) * step / 100.0
+
+
+def evaluate_allocations(inputs, weights, steps_per_year):
+    """
+    Symuluje wszystkie zestawy proporcji naraz na tej samej macierzy cen.
+    weights: (N, A + 1) - udziały aktywów, ostatnia kolumna to obligacje.
+
+    Zwraca (roczna stopa zwrotu, roczna zmienność, wartość końcowa); stopy liczone
+    są ważone czasem, tzn. z pominięciem efektu nowych wpłat.
+    """
+    result = simulate_batch(
+        inputs["prices"],
+        pros=weights[:, :-1],
+        bonds_pro=weights[:, -1],
+        growth_factor=inputs["growth_factor"],
+        january=inputs["january"],
+        contributions=inputs["contributions"],
+        initial_investment=inputs["initial_investment"],
+        rebalance=inputs["rebalance"],
+    )
+    totals = result["total"]
+    new_money = np.where(inputs["january"], inputs["contributions"], 0.0)[1:]
+
+    base = totals[:, :-1] + new_money
+    step_returns = np.divide(totals[:, 1:], base, out=np.ones_like(base), where=base > 0) - 1
+    n_steps = step_returns.shape[1]
+
+    growth = np.prod(1 + step_returns, axis=1)
+    annual_return = growth ** (steps_per_year / max(n_steps, 1)) - 1
+    volatility = step_returns.std(axis=1, ddof=1) * np.sqrt(steps_per_year) if n_steps > 1 else np.zeros(len(weights))
+    return annual_return, volatility, totals[:, -1]
+
+
+def efficient_frontier(returns, volatilities):
+    """Maska kandydatów, których nie da się poprawić (wyższy zwrot przy niższej zmienności)."""
+    order = np.lexsort((-returns, volatilities))
+    best_so_far = np.maximum.accumulate(returns[order])
+    on_frontier = np.empty(len(returns), dtype=bool)
+    on_frontier[order] = np.concatenate(([True], returns[order][1:] > best_so_far[:-1]))
+    return on_frontier
+
+
+def _init_worker(inputs, steps_per_year):
+    global _shared_inputs
+    _shared_inputs = (inputs, steps_per_year)
+
+
+def _evaluate_chunk(weights):
+    inputs, steps_per_year = _shared_inputs
+    return evaluate_allocations(inputs, weights, steps_per_year)
+
+
+def run_allocation_sweep(sim, yearly_investment, step=5, max_workers=None, chunk_size=500):
+    """
+    Ocena wszystkich proporcji (krok 'step' %, suma 100%) dla aktywów GrowthSimulation
+    i obligacji. Ceny pobierane są raz; paczki kandydatów liczą procesy z puli,
+    każdy z jedną kopią macierzy cen.
+
+    :return: DataFrame z udziałami (%), 'Return', 'Volatility', 'Final Value' i 'Frontier'
+    """
+    inputs = growth_simulation_inputs(sim, yearly_investment)
+    weights = allocation_grid(len(inputs["names"]) + 1, step)
+    steps_per_year = 365 / max(int(sim.recalibration_period * 365), 1)
+    chunks = [weights[i:i + chunk_size] for i in range(0, len(weights), chunk_size)]
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        parts = [evaluate_allocations(inputs, chunk, steps_per_year) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 initializer=_init_worker,
+                                 initargs=(inputs, steps_per_year)) as executor:
+            parts = list(executor.map(_evaluate_chunk, chunks))
+
+    returns = np.concatenate([part[0] for part in parts])
+    volatilities = np.concatenate([part[1] for part in parts])
+    final_values = np.concatenate([part[2] for part in parts])
+
+    labels = [ASSET_LABELS.get(name, name) for name in inputs["names"]] + ["Bonds"]
+    df = pd.DataFrame(np.round(weights * 100).astype(int), columns=labels)
+    df["Return"] = returns
+    df["Volatility"] = volatilities
+    df["Final Value"] = final_values
+    df["Frontier"] = efficient_frontier(returns, volatilities)
+    return df
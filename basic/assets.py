@@ -33,20 +33,65 @@ class InvestmentStrategy:
 
 
 class Asset:
-    """Bazowa klasa do pobierania cen aktywów z YF (np. złoto, ETFy, krypto)."""
-    def __init__(self, ticker):
+    """Bazowa klasa do pobierania cen aktywów (np. złoto, ETFy, krypto) od dostawcy danych."""
+    def __init__(self, ticker, max_gap_days=30):
         self.ticker = ticker
         self.price = 0
+        # Ile dni do przodu od 'date' szukamy pierwszego notowania
+        self.max_gap_days = max_gap_days
+        # Posortowane daty (datetime64[D]) i ceny zamknięcia całej historii
+        self.dates = None
+        self.closes = None
+
+    def load_prices(self, force=False):
+        """
+        Pobiera jednorazowo całą historię cen zamknięcia dla tickera
+        i trzyma ją w pamięci jako posortowane tablice.
+        """
+        if self.dates is not None and not force:
+            return
+
+        data = get_provider().history(self.ticker, period="max")
+        if data.empty:
+            self.dates = np.array([], dtype="datetime64[D]")
+            self.closes = np.array([], dtype=float)
+            return
+
+        close = data['Close'].dropna()
+
+        dates = close.index.values.astype("datetime64[D]")
+        closes = close.to_numpy(dtype=float)
+        order = np.argsort(dates, kind="stable")
+        self.dates = dates[order]
+        self.closes = closes[order]
 
     def fetch_price(self, date):
         """
-        Pobiera cenę aktywa na dany 'date' (w przybliżeniu)
-        posiłkując się 30 dniami do przodu.
+        Zwraca pierwszą cenę zamknięcia w dniu 'date' lub później
+        (maksymalnie 'max_gap_days' dni do przodu), wyszukując binarnie
+        w historii wczytanej przez load_prices().
+        """
+        self.load_prices()
+        target = np.datetime64(date, "D")
+        idx = np.searchsorted(self.dates, target, side="left")
+        if idx < len(self.dates) and self.dates[idx] < target + np.timedelta64(self.max_gap_days, "D"):
+            return self.closes[idx].item()
+        raise ValueError(f"Unable to fetch price for {self.ticker} on date: {date}")
+
+    def prices_at(self, dates):
         """
-        end_date = (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=30)).strftime("%Y-%m-%d")
-        data = yf.download(self.ticker, start=date, end=end_date, progress=False)
-        if not data.empty:
-            # Pierwszy 'Close' który nie jest NaN
-            return data['Close'].dropna().iloc[0].item()
-        else:
-            raise ValueError(f"Unable to fetch price for {self.ticker} on date: {date}")
+        Wektorowa wersja fetch_price dla tablicy dat;
+        tam, gdzie fetch_price zgłosiłby błąd, zwraca 0.
+        """
+        self.load_prices()
+        targets = np.asarray(dates, dtype="datetime64[D]")
+        prices = np.zeros(len(targets))
+        if len(self.dates) == 0:
+            return prices
+
+        idx = np.searchsorted(self.dates, targets, side="left")
+        found = idx < len(self.dates)
+        idx = np.minimum(idx, len(self.dates) - 1)
+        found &= self.dates[idx] < targets + np.timedelta64(self.max_gap_days, "D")
+        prices[found] = self.closes[idx[found]]
+        return prices
@@ -1,5 +1,6 @@
 from .assets import *
 from .imports import *
+from .simulation_engine import run_growth_simulation
 
 class GrowthPortfolio:
     """
@@ -184,3 +185,10 @@ class GrowthSimulation:
                 total_invested += yearly_investment * self.strategy.rise_investment
 
         return results
+
+    def run_frame(self, yearly_investment):
+        """
+        Wektorowa wersja run(): cały harmonogram i macierz cen liczone są naraz,
+        wynik (te same liczby co w run()) zwracany jest jako DataFrame.
+        """
+        return run_growth_simulation(self, yearly_investment)
@@ -1,5 +1,6 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-import yfinance as yf
+import numpy as np
+from market_data import get_provider
 from datetime import datetime, timedelta
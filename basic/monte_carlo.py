@@ -0,0 +1,94 @@
+from .imports import *
+from .simulation_engine import growth_simulation_inputs, simulate_batch
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def historical_step_returns(prices):
+    """
+    Stopy zwrotu brutto (P_t+1 / P_t) między kolejnymi krokami harmonogramu.
+    Pomijamy kroki, w których którekolwiek aktywo nie miało notowania.
+    """
+    prices = np.asarray(prices, dtype=float)
+    valid = (prices[:-1] > 0).all(axis=1) & (prices[1:] > 0).all(axis=1)
+    return prices[1:][valid] / prices[:-1][valid]
+
+
+def block_bootstrap(returns, n_paths, n_steps, block_size=12, rng=None):
+    """
+    Losuje ścieżki stóp zwrotu (n_paths, n_steps, A) sklejając losowe bloki
+    kolejnych historycznych kroków - zachowuje korelacje i krótką autokorelację.
+    """
+    rng = np.random.default_rng(rng)
+    block_size = max(1, min(block_size, len(returns)))
+    n_blocks = -(-n_steps // block_size)
+    starts = rng.integers(0, len(returns) - block_size + 1, size=(n_paths, n_blocks))
+    idx = (starts[..., np.newaxis] + np.arange(block_size)).reshape(n_paths, -1)[:, :n_steps]
+    return returns[idx]
+
+
+def parametric_returns(returns, n_paths, n_steps, rng=None):
+    """
+    Losuje ścieżki stóp zwrotu z wielowymiarowego rozkładu log-normalnego
+    dopasowanego (średnia + kowariancja) do historycznych log-zwrotów.
+    """
+    rng = np.random.default_rng(rng)
+    log_returns = np.log(returns)
+    mean = log_returns.mean(axis=0)
+    cov = np.atleast_2d(np.cov(log_returns, rowvar=False))
+    draws = rng.multivariate_normal(mean, cov, size=(n_paths, n_steps), method="cholesky")
+    return np.exp(draws)
+
+
+def price_paths(start_prices, gross_returns):
+    """Ścieżki cen (n_paths, n_steps + 1, A) startujące z 'start_prices'."""
+    n_paths = gross_returns.shape[0]
+    first = np.broadcast_to(start_prices, (n_paths, 1, len(start_prices)))
+    return np.concatenate([first, first * np.cumprod(gross_returns, axis=1)], axis=1)
+
+
+def run_growth_monte_carlo(sim, yearly_investment, n_paths=10000, method="bootstrap",
+                           block_size=12, percentiles=DEFAULT_PERCENTILES, seed=None):
+    """
+    Symulacja Monte Carlo portfela GrowthSimulation: te same proporcje, wpłaty
+    i styczniowy rebalancing, ale na n_paths losowych ścieżkach cen aktywów
+    (obligacje rosną deterministycznie jak w symulacji historycznej).
+    Wszystkie ścieżki liczone są jedną wektorową paczką.
+
+    :param method: "bootstrap" (blokowy bootstrap historii) lub "parametric" (log-normalny)
+    :return: (bands, terminal) - DataFrame z percentylami wartości portfela
+             w czasie oraz tablica wartości końcowych wszystkich ścieżek
+    """
+    inputs = growth_simulation_inputs(sim, yearly_investment)
+    prices = inputs["prices"]
+    n_steps = len(inputs["dates"]) - 1
+
+    returns = historical_step_returns(prices)
+    if n_steps < 1 or len(returns) < 2:
+        raise ValueError("Not enough price history for a Monte Carlo simulation")
+
+    rng = np.random.default_rng(seed)
+    if method == "bootstrap":
+        gross_returns = block_bootstrap(returns, n_paths, n_steps, block_size, rng)
+    elif method == "parametric":
+        gross_returns = parametric_returns(returns, n_paths, n_steps, rng)
+    else:
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+
+    result = simulate_batch(
+        price_paths(prices[0], gross_returns),
+        pros=inputs["pros"],
+        bonds_pro=inputs["bonds_pro"],
+        growth_factor=inputs["growth_factor"],
+        january=inputs["january"],
+        contributions=inputs["contributions"],
+        initial_investment=inputs["initial_investment"],
+        rebalance=inputs["rebalance"],
+    )
+    totals = result["total"]
+
+    bands = pd.DataFrame({"Date": np.datetime_as_string(inputs["dates"], unit="D")})
+    for p, values in zip(percentiles, np.percentile(totals, percentiles, axis=0)):
+        bands[f"P{p}"] = values
+    bands["Invested"] = inputs["invested"]
+    return bands, totals[:, -1]
@@ -1,5 +1,7 @@
 from .imports import *
 from .growth_portfolio import *
+from .monte_carlo import run_growth_monte_carlo
+from .allocation_sweep import run_allocation_sweep
 
 
 def run_growth_portfolio():
@@ -68,6 +70,23 @@ def run_growth_portfolio():
         st.error(f"Asset proportions must sum to 100%! Current sum: {total_pro}%")
         st.stop()
 
+    # Monte Carlo scenarios
+    run_monte_carlo = st.checkbox("Add Monte Carlo scenarios (risk analysis)")
+    if run_monte_carlo:
+        mc_col1, mc_col2, mc_col3 = st.columns(3)
+        with mc_col1:
+            mc_paths = st.select_slider("Number of paths", options=[1000, 2000, 5000, 10000, 20000], value=10000)
+        with mc_col2:
+            mc_method_label = st.selectbox("Return model", ["Block bootstrap", "Parametric (log-normal)"])
+        with mc_col3:
+            mc_block_size = st.slider("Bootstrap block length (steps)", 1, 24, 12)
+        mc_method = "bootstrap" if mc_method_label == "Block bootstrap" else "parametric"
+
+    # Allocation sweep (efficient frontier)
+    run_sweep = st.checkbox("Search all allocations and show the efficient frontier")
+    if run_sweep:
+        sweep_step = st.selectbox("Allocation grid step (%)", [5, 10, 20], index=0)
+
     if st.button("Run simulation"):
         bond_asset = BondAsset(inflation, yield_rate)
         strategy = InvestmentStrategy(rise_investment=1)
@@ -99,8 +118,7 @@ def run_growth_portfolio():
             years=duration_years
         )
 
-        results = sim.run(yearly_investment)
-        df_results = pd.DataFrame(results)
+        df_results = sim.run_frame(yearly_investment)
 
         df_results['Gold Value'] = df_results['Gold Units'] * df_results['Gold Price']
         df_results['ETF EM Value'] = df_results['ETF EM Units'] * df_results['ETF EM Price']
@@ -265,4 +283,140 @@ def run_growth_portfolio():
         )
         st.plotly_chart(fig_etfs, use_container_width=True)
 
+        if run_monte_carlo:
+            st.write("### Monte Carlo Scenarios")
+            try:
+                bands, terminal_values = run_growth_monte_carlo(
+                    sim,
+                    yearly_investment,
+                    n_paths=mc_paths,
+                    method=mc_method,
+                    block_size=mc_block_size
+                )
+            except ValueError as e:
+                st.error(f"Error: {e}")
+                bands = None
+
+            if bands is not None:
+                # Chart 5: percentile bands of the portfolio value
+                fig_bands = go.Figure()
+                fig_bands.add_trace(go.Scatter(
+                    x=bands['Date'], y=bands['P95'], mode='lines',
+                    line=dict(width=0), showlegend=False, hoverinfo='skip'
+                ))
+                fig_bands.add_trace(go.Scatter(
+                    x=bands['Date'], y=bands['P5'], mode='lines', fill='tonexty',
+                    fillcolor='rgba(0, 128, 0, 0.15)', line=dict(width=0),
+                    name='5th-95th percentile'
+                ))
+                fig_bands.add_trace(go.Scatter(
+                    x=bands['Date'], y=bands['P75'], mode='lines',
+                    line=dict(width=0), showlegend=False, hoverinfo='skip'
+                ))
+                fig_bands.add_trace(go.Scatter(
+                    x=bands['Date'], y=bands['P25'], mode='lines', fill='tonexty',
+                    fillcolor='rgba(0, 128, 0, 0.3)', line=dict(width=0),
+                    name='25th-75th percentile'
+                ))
+                fig_bands.add_trace(go.Scatter(
+                    x=bands['Date'], y=bands['P50'], mode='lines',
+                    name='Median', line=dict(color='green')
+                ))
+                fig_bands.add_trace(go.Scatter(
+                    x=df_results['Date'], y=df_results['Total'], mode='lines',
+                    name='Historical path', line=dict(color='black', dash='dot')
+                ))
+                fig_bands.add_trace(go.Scatter(
+                    x=bands['Date'], y=bands['Invested'], mode='lines',
+                    name='Invested Funds', line=dict(color='blue', dash='dot')
+                ))
+                fig_bands.update_layout(
+                    title=f'Portfolio Value Percentiles ({mc_paths:,} paths, {mc_method_label})',
+                    xaxis_title='Date',
+                    yaxis_title='Value (USD)',
+                    template='plotly_white',
+                    hovermode='x unified'
+                )
+                st.plotly_chart(fig_bands, use_container_width=True)
+
+                # Chart 6: distribution of terminal values
+                fig_terminal = go.Figure()
+                fig_terminal.add_trace(go.Histogram(
+                    x=terminal_values,
+                    nbinsx=60,
+                    marker_color='green',
+                    name='Final value'
+                ))
+                fig_terminal.add_vline(x=bands['Invested'].iloc[-1], line_dash='dot', line_color='blue')
+                fig_terminal.update_layout(
+                    title='Distribution of Final Portfolio Value',
+                    xaxis_title='Final value (USD)',
+                    yaxis_title='Number of paths',
+                    template='plotly_white'
+                )
+                st.plotly_chart(fig_terminal, use_container_width=True)
+
+                loss_probability = (terminal_values < bands['Invested'].iloc[-1]).mean() * 100
+                st.markdown(f"**Median final value:** {np.median(terminal_values):,.2f} USD  \n"
+                            f"**5th percentile:** {np.percentile(terminal_values, 5):,.2f} USD  \n"
+                            f"**95th percentile:** {np.percentile(terminal_values, 95):,.2f} USD  \n"
+                            f"**Probability of ending below invested funds:** {loss_probability:,.2f}%")
+
+        if run_sweep:
+            st.write("### Allocation Sweep and Efficient Frontier")
+            with st.spinner("Evaluating allocations..."):
+                sweep = run_allocation_sweep(sim, yearly_investment, step=sweep_step)
+
+            frontier = sweep[sweep['Frontier']].sort_values('Volatility')
+            allocation_columns = [c for c in sweep.columns if c not in ('Return', 'Volatility', 'Final Value', 'Frontier')]
+            hover_text = sweep[allocation_columns].apply(
+                lambda row: ", ".join(f"{name}: {value}%" for name, value in row.items()), axis=1
+            )
+
+            # Chart 7: return vs. volatility of all candidates
+            fig_sweep = go.Figure()
+            fig_sweep.add_trace(go.Scattergl(
+                x=sweep['Volatility'] * 100,
+                y=sweep['Return'] * 100,
+                mode='markers',
+                marker=dict(size=4, color='lightgray'),
+                text=hover_text,
+                hovertemplate="%{text}<br>Volatility: %{x:.2f}%<br>Return: %{y:.2f}%<extra></extra>",
+                name='Candidate allocations'
+            ))
+            fig_sweep.add_trace(go.Scatter(
+                x=frontier['Volatility'] * 100,
+                y=frontier['Return'] * 100,
+                mode='lines+markers',
+                line=dict(color='green'),
+                text=hover_text[frontier.index],
+                hovertemplate="%{text}<br>Volatility: %{x:.2f}%<br>Return: %{y:.2f}%<extra></extra>",
+                name='Efficient frontier'
+            ))
+            current = sweep[
+                (sweep[allocation_columns] == [gold_pro, etf_em_pro, etf_msci_pro, crypto_pro, bonds_pro]).all(axis=1)
+            ]
+            if not current.empty:
+                fig_sweep.add_trace(go.Scatter(
+                    x=current['Volatility'] * 100,
+                    y=current['Return'] * 100,
+                    mode='markers',
+                    marker=dict(size=12, color='red', symbol='star'),
+                    name='Selected allocation'
+                ))
+            fig_sweep.update_layout(
+                title=f'Annual Return vs. Volatility ({len(sweep):,} allocations)',
+                xaxis_title='Annual volatility (%)',
+                yaxis_title='Annual return (%)',
+                template='plotly_white'
+            )
+            st.plotly_chart(fig_sweep, use_container_width=True)
+
+            st.write("#### Allocations on the efficient frontier")
+            frontier_table = frontier.drop(columns='Frontier').copy()
+            frontier_table['Return'] = (frontier_table['Return'] * 100).round(2)
+            frontier_table['Volatility'] = (frontier_table['Volatility'] * 100).round(2)
+            frontier_table['Final Value'] = frontier_table['Final Value'].round(2)
+            st.dataframe(frontier_table.reset_index(drop=True), use_container_width=True)
+
     st.write("**By investing, you invest at your own risk.**")
@@ -66,8 +66,7 @@ def run_defensive_portfolio():
             years=duration_years
         )
 
-        results = sim.run(yearly_investment)
-        df_results = pd.DataFrame(results)
+        df_results = sim.run_frame(yearly_investment)
 
         df_results['Gold Value'] = df_results['Gold Price'] * df_results['Gold Units']
 
@@ -1,5 +1,6 @@
 from .imports import *
 from .assets import *
+from .simulation_engine import run_safe_simulation
 
 
 class SafePortfolio:
@@ -46,6 +47,9 @@ class SafeSimulation:
         self.start_year = start_year
         self.years = years
 
+        # Złoto np. "GC=F" (Gold Futures) - historia wczytywana raz na całą symulację
+        self.gold_asset = Asset("GC=F")
+
         # np. co 0.085 roku (ok. 31 dni) robimy update cen i inwestycje
         self.recalibration_period = 0.085
         self.recalibration_bool = True
@@ -58,9 +62,7 @@ class SafeSimulation:
         Pobiera cenę złota + aktualizuje wartości obligacji.
         """
         try:
-            # Dla złota np. "GC=F" (Gold Futures)
-            asset = Asset("GC=F")
-            self.portfolio.gold_price = asset.fetch_price(current_date)
+            self.portfolio.gold_price = self.gold_asset.fetch_price(current_date)
         except ValueError as e:
             print(e)
             self.portfolio.gold_price = 0
@@ -138,3 +140,10 @@ class SafeSimulation:
                 total_invested += yearly_investment * self.strategy.rise_investment
 
         return results
+
+    def run_frame(self, yearly_investment):
+        """
+        Wektorowa wersja run(): cały harmonogram i macierz cen liczone są naraz,
+        wynik (te same liczby co w run()) zwracany jest jako DataFrame.
+        """
+        return run_safe_simulation(self, yearly_investment)
@@ -0,0 +1,219 @@
+from .imports import *
+
+# Etykiety kolumn wyników dla nazw aktywów używanych w portfelach
+ASSET_LABELS = {
+    "gold": "Gold",
+    "etf_em": "ETF EM",
+    "etf_msci": "ETF MSCI",
+    "crypto": "Crypto",
+}
+
+
+def build_schedule(start_year, years, recalibration_period):
+    """
+    Daty kroków symulacji (datetime64[D]) - dokładnie te, które zapisuje pętla run():
+    start + k * krok dla k >= 1, dopóki data < start + years * 365 dni.
+    """
+    start = np.datetime64(f"{start_year}-01-01", "D")
+    end = start + np.timedelta64(int(years * 365), "D")
+    step = np.timedelta64(max(int(recalibration_period * 365), 1), "D")
+    return np.arange(start + step, end, step)
+
+
+def january_mask(dates):
+    """True dla kroków wypadających w styczniu (wpłata + rebalancing)."""
+    return dates.astype("datetime64[M]").astype(np.int64) % 12 == 0
+
+
+def price_matrix(assets, dates):
+    """Macierz cen (kroki x aktywa); 0 tam, gdzie brak notowania (jak w update_prices)."""
+    if not assets:
+        return np.zeros((len(dates), 0))
+    return np.column_stack([asset.prices_at(dates) for asset in assets])
+
+
+def rise_sequence(strategy, counts):
+    """
+    Mnożnik wpłaty (strategy.rise_investment) po 'counts' wywołaniach
+    investment_growth() - liczony tak jak w strategii, bez jej modyfikowania.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    rise_investment = strategy.rise_investment
+    values = [rise_investment]
+    for _ in range(int(counts.max()) if counts.size else 0):
+        if rise_investment * strategy.rise < 3:
+            rise_investment *= strategy.rise
+        values.append(rise_investment)
+    return np.array(values)[counts]
+
+
+def simulate_batch(prices, pros, bonds_pro, growth_factor, january, contributions,
+                   initial_investment, rebalance=True):
+    """
+    Symuluje naraz wiele portfeli (oś B: ścieżki cen albo zestawy proporcji).
+
+    :param prices: ceny (B, S, A) lub (S, A) - kroki x aktywa
+    :param pros: proporcje aktywów (B, A) lub (A,)
+    :param bonds_pro: udział obligacji (B,) lub skalar
+    :param growth_factor: wzrost obligacji na jeden krok
+    :param january: maska (S,) kroków ze styczniową wpłatą i rebalancingiem
+    :param contributions: (S,) kwota wpłacana w danym (styczniowym) kroku
+    :param initial_investment: pierwsza wpłata, kupowana po cenach z kroku 0
+    :return: słownik z tablicami 'units' (B, S, A), 'bonds' (B, S), 'total' (B, S)
+
+    Jednostki zmieniają się tylko w kroku 0 i w styczniu, więc pętla biegnie
+    wyłącznie po tych zdarzeniach; wartości pomiędzy nimi liczone są tablicowo.
+    """
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 2:
+        prices = prices[np.newaxis]
+    pros = np.atleast_2d(np.asarray(pros, dtype=float))
+    batch = max(prices.shape[0], pros.shape[0], np.size(bonds_pro))
+    steps, n_assets = prices.shape[1], prices.shape[2]
+    bonds_pro = np.broadcast_to(np.asarray(bonds_pro, dtype=float), (batch,))
+    pros = np.broadcast_to(pros, (batch, n_assets))
+    prices = np.broadcast_to(prices, (batch, steps, n_assets))
+
+    if steps == 0:
+        return {
+            "units": np.zeros((batch, 0, n_assets)),
+            "bonds": np.zeros((batch, 0)),
+            "total": np.zeros((batch, 0)),
+        }
+
+    # Potęgi wzrostu obligacji liczone kolejnym mnożeniem, jak w pętli
+    growth_powers = np.cumprod(np.concatenate(([1.0], np.full(steps, growth_factor))))
+
+    # Stan po pierwszej wpłacie (przed drugą aktualizacją cen w kroku 0)
+    first_prices = prices[:, 0]
+    units = np.where(first_prices > 0, initial_investment * pros / np.where(first_prices > 0, first_prices, 1), 0.0)
+    bonds = initial_investment * bonds_pro
+    previous_step = -1
+
+    event_steps = np.flatnonzero(january | (np.arange(steps) == 0))
+    event_units = np.empty((batch, len(event_steps), n_assets))
+    event_bonds = np.empty((batch, len(event_steps)))
+
+    for e, k in enumerate(event_steps):
+        bonds = bonds * growth_powers[k - previous_step]
+        if january[k]:
+            current = prices[:, k]
+            tradable = current > 0
+            safe_prices = np.where(tradable, current, 1)
+            amount = contributions[k]
+            units = units + np.where(tradable, amount * pros / safe_prices, 0.0)
+            bonds = bonds + amount * bonds_pro
+            if rebalance:
+                total = (units * current).sum(axis=1) + bonds
+                units = np.where(tradable, total[:, np.newaxis] * pros / safe_prices, units)
+                bonds = total * bonds_pro
+        event_units[:, e] = units
+        event_bonds[:, e] = bonds
+        previous_step = k
+
+    # Każdy krok dziedziczy stan po ostatnim zdarzeniu; obligacje dalej rosną
+    event_of_step = np.searchsorted(event_steps, np.arange(steps), side="right") - 1
+    units_path = event_units[:, event_of_step]
+    bonds_path = event_bonds[:, event_of_step] * growth_powers[np.arange(steps) - event_steps[event_of_step]]
+    total_path = np.einsum("bsa,bsa->bs", units_path, prices) + bonds_path
+
+    return {"units": units_path, "bonds": bonds_path, "total": total_path}
+
+
+def _invested(yearly_investment, january, rise_after_step):
+    """Kolumna 'Invested': suma wpłat zaksięgowanych przed zapisem danego kroku."""
+    added = np.where(january, yearly_investment * rise_after_step, 0.0)
+    return yearly_investment + np.concatenate(([0.0], np.cumsum(added)[:-1]))
+
+
+def run_safe_simulation(sim, yearly_investment):
+    """
+    Wektorowy odpowiednik SafeSimulation.run() - zwraca DataFrame z tymi samymi
+    kolumnami i wartościami. Nie modyfikuje portfela ani strategii.
+    """
+    dates = build_schedule(sim.start_year, sim.years, sim.recalibration_period)
+    january = january_mask(dates)
+    steps = np.arange(len(dates))
+
+    # SafeSimulation wywołuje investment_growth() po każdym kroku
+    rise_before = rise_sequence(sim.strategy, steps)
+    rise_after = rise_sequence(sim.strategy, steps + 1)
+
+    prices = price_matrix([sim.gold_asset], dates)
+    result = simulate_batch(
+        prices,
+        pros=[sim.portfolio.gold_pro],
+        bonds_pro=sim.portfolio.bonds_pro,
+        growth_factor=sim.bond_asset.calculate_growth_factor(sim.recalibration_period),
+        january=january,
+        contributions=yearly_investment * rise_before,
+        initial_investment=yearly_investment * sim.strategy.rise_investment,
+        rebalance=sim.recalibration_bool,
+    )
+
+    return pd.DataFrame({
+        "Date": np.datetime_as_string(dates, unit="D"),
+        "Gold Price": prices[:, 0],
+        "Gold Units": result["units"][0, :, 0],
+        "Bonds": result["bonds"][0],
+        "Total": result["total"][0],
+        "Invested": _invested(yearly_investment, january, rise_after),
+    })
+
+
+def growth_simulation_inputs(sim, yearly_investment):
+    """
+    Harmonogram, macierz cen i parametry simulate_batch dla GrowthSimulation.
+    Współdzielone przez symulację historyczną, Monte Carlo i przegląd proporcji.
+    """
+    dates = build_schedule(sim.start_year, sim.years, sim.recalibration_period)
+    january = january_mask(dates)
+
+    # GrowthSimulation wywołuje investment_growth() tylko po styczniowych krokach
+    growth_calls = np.cumsum(january)
+    rise_before = rise_sequence(sim.strategy, growth_calls - january)
+    rise_after = rise_sequence(sim.strategy, growth_calls)
+
+    names = list(sim.assets.keys())
+    return {
+        "dates": dates,
+        "names": names,
+        "prices": price_matrix(list(sim.assets.values()), dates),
+        "pros": np.array([getattr(sim.portfolio, f"{name}_pro") for name in names], dtype=float),
+        "bonds_pro": sim.portfolio.bonds_pro,
+        "growth_factor": sim.bond_asset.calculate_growth_factor(sim.recalibration_period),
+        "january": january,
+        "contributions": yearly_investment * rise_before,
+        "initial_investment": yearly_investment * sim.strategy.rise_investment,
+        "rebalance": sim.recalibration_bool,
+        "invested": _invested(yearly_investment, january, rise_after),
+    }
+
+
+def run_growth_simulation(sim, yearly_investment):
+    """
+    Wektorowy odpowiednik GrowthSimulation.run() - zwraca DataFrame z tymi samymi
+    kolumnami i wartościami. Nie modyfikuje portfela ani strategii.
+    """
+    inputs = growth_simulation_inputs(sim, yearly_investment)
+    prices = inputs["prices"]
+    result = simulate_batch(
+        prices,
+        pros=inputs["pros"],
+        bonds_pro=inputs["bonds_pro"],
+        growth_factor=inputs["growth_factor"],
+        january=inputs["january"],
+        contributions=inputs["contributions"],
+        initial_investment=inputs["initial_investment"],
+        rebalance=inputs["rebalance"],
+    )
+
+    columns = {"Date": np.datetime_as_string(inputs["dates"], unit="D")}
+    for i, name in enumerate(inputs["names"]):
+        label = ASSET_LABELS.get(name, name)
+        columns[f"{label} Units"] = result["units"][0, :, i]
+        columns[f"{label} Price"] = prices[:, i]
+    columns["Bonds"] = result["bonds"][0]
+    columns["Total"] = result["total"][0]
+    columns["Invested"] = inputs["invested"]
+    return pd.DataFrame(columns)
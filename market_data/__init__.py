@@ -0,0 +1,4 @@
+from .provider import MarketDataProvider, get_provider, set_provider, normalize_ohlcv, OHLCV_COLUMNS, STATEMENTS
+from .replay_provider import ReplayProvider, record
+from .bar_store import BarStore
+from .concurrent_download import download_many
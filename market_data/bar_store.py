@@ -0,0 +1,145 @@
+from .provider import *
+import time
+import tempfile
+import numpy as np
+
+DEFAULT_BAR_STORE_DIR = os.environ.get('BAR_STORE_DIR', os.path.join('.cache', 'bars'))
+
+# Kolumny porównywane przy wykrywaniu rewizji historii (np. korekty po splicie)
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+class BarStore:
+    """
+    Lokalny magazyn dziennych notowań: jeden plik CSV na ticker + metadane.
+    Przy odświeżeniu pobiera tylko słupki od ostatniej zapisanej daty,
+    a gdy dostawca zrewidował niedawną historię - tylko zmieniony zakres.
+    """
+    def __init__(self, root=DEFAULT_BAR_STORE_DIR, provider=None, overlap=5,
+                 refresh_interval=15 * 60, rtol=1e-6):
+        self.root = root
+        self.provider = provider
+        # Ile ostatnich zapisanych słupków pobieramy ponownie do porównania
+        self.overlap = overlap
+        # Minimalny odstęp (s) między odpytaniami dostawcy o ten sam ticker
+        self.refresh_interval = refresh_interval
+        self.rtol = rtol
+
+    def _provider(self):
+        return self.provider if self.provider is not None else get_provider()
+
+    def _paths(self, ticker):
+        base = os.path.join(self.root, ticker)
+        return base + '.csv', base + '.json'
+
+    def load(self, ticker):
+        """Zwraca zapisane notowania tickera (pusty DataFrame, jeśli brak)."""
+        data_path, _ = self._paths(ticker)
+        if not os.path.exists(data_path):
+            return normalize_ohlcv(None)
+        return normalize_ohlcv(pd.read_csv(data_path, index_col='Date', parse_dates=['Date'], float_precision='round_trip'))
+
+    def _load_meta(self, ticker):
+        _, meta_path = self._paths(ticker)
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def last_date(self, ticker):
+        """Data ostatniego zapisanego słupka albo None."""
+        meta = self._load_meta(ticker)
+        return pd.Timestamp(meta['last_date']) if meta.get('last_date') else None
+
+    def _save(self, ticker, data, start):
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+        # '%.17g' zapewnia, że liczby po odczycie są bit w bit takie same jak zapisane
+        _atomic_write(data_path, lambda f: data.to_csv(f, float_format='%.17g'))
+        meta = {
+            'start': start,
+            'last_date': data.index[-1].strftime('%Y-%m-%d') if not data.empty else None,
+            'refreshed_at': time.time(),
+        }
+        _atomic_write(meta_path, lambda f: json.dump(meta, f))
+
+    def get(self, ticker, start='2010-01-01'):
+        """Zwraca notowania od 'start', wcześniej dociągając brakujące słupki."""
+        data = self.refresh(ticker, start)
+        return data[data.index >= pd.Timestamp(start)].copy()
+
+    def refresh(self, ticker, start='2010-01-01'):
+        """
+        Aktualizuje magazyn dla tickera i zwraca całą zapisaną historię.
+        """
+        meta = self._load_meta(ticker)
+        stored = self.load(ticker)
+        provider = self._provider()
+
+        # Brak danych lub prośba o wcześniejszy początek niż zapisany - pełne pobranie
+        if stored.empty or not meta.get('start') or pd.Timestamp(start) < pd.Timestamp(meta['start']):
+            data = provider.history(ticker, start=start)
+            if data.empty and not stored.empty:
+                print(f"[WARN] Empty history for {ticker} from the provider, keeping stored bars")
+                return stored
+            self._save(ticker, data, start)
+            return data
+
+        if time.time() - meta.get('refreshed_at', 0) < self.refresh_interval:
+            return stored
+
+        lookback = min(self.overlap, len(stored))
+        while True:
+            fetch_start = stored.index[-lookback]
+            fresh = provider.history(ticker, start=fetch_start.strftime('%Y-%m-%d'))
+            if fresh.empty or fresh.index[0] > fetch_start:
+                # Pusta albo ucięta odpowiedź to nieudane pobranie, a nie rewizja -
+                # nigdy nie zastępujemy nią zapisanej historii
+                print(f"[WARN] Incomplete history for {ticker} from the provider, keeping stored bars")
+                return stored
+            revised_from = self._first_revision(stored, fresh, fetch_start)
+
+            if revised_from is None or revised_from > fetch_start:
+                # Rewizja (jeśli jest) zaczyna się wewnątrz pobranego zakresu
+                break
+            if lookback >= len(stored):
+                # Zrewidowana cała historia - właśnie pobraliśmy ją w całości
+                self._save(ticker, fresh, meta['start'])
+                return fresh
+            # Najstarszy porównany słupek też się zmienił - cofamy się dalej
+            lookback = min(lookback * 4, len(stored))
+
+        # Zastępujemy wszystko od pierwszego zrewidowanego (lub nowego) słupka
+        cut = revised_from if revised_from is not None else fresh.index[0]
+        data = pd.concat([stored[stored.index < cut], fresh[fresh.index >= cut]])
+        self._save(ticker, data, meta['start'])
+        return data
+
+    def _first_revision(self, stored, fresh, since):
+        """
+        Zwraca datę pierwszego słupka, którego ceny różnią się od zapisanych
+        (pomijając ostatni zapisany słupek, który mógł być niepełnym dniem).
+        """
+        old = stored[(stored.index >= since) & (stored.index < stored.index[-1])]
+        common = old.index.intersection(fresh.index)
+        missing = old.index.difference(fresh.index)
+
+        columns = [column for column in PRICE_COLUMNS if column in old.columns and column in fresh.columns]
+        old_values = old.loc[common, columns].to_numpy(dtype=float)
+        new_values = fresh.loc[common, columns].to_numpy(dtype=float)
+        changed = ~np.isclose(old_values, new_values, rtol=self.rtol, equal_nan=True).all(axis=1)
+
+        candidates = list(common[changed]) + list(missing)
+        return min(candidates) if candidates else None
+
+
+def _atomic_write(path, write):
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
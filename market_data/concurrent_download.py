@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def download_many(tickers, fetch, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Wywołuje fetch(ticker) dla wielu tickerów równolegle w ograniczonej puli wątków.
+    Błąd jednego tickera nie przerywa pozostałych.
+
+    Zwraca krotkę (results, errors): słowniki ticker -> wynik / wyjątek.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    results, errors = {}, {}
+    if not tickers:
+        return results, errors
+
+    workers = max(1, min(max_workers, len(tickers)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='download') as executor:
+        futures = {executor.submit(fetch, ticker): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                errors[ticker] = e
+    return results, errors
@@ -0,0 +1,3 @@
+import os
+import json
+import pandas as pd
@@ -0,0 +1,101 @@
+from .imports import *
+
+# Kolumny OHLCV, które każdy dostawca zwraca w tej samej postaci
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Sprawozdania finansowe dostępne u każdego dostawcy
+STATEMENTS = ['financials', 'quarterly_financials', 'balance_sheet', 'cashflow']
+
+
+def normalize_ohlcv(df):
+    """
+    Sprowadza notowania do wspólnego formatu: płaskie kolumny OHLCV,
+    indeks 'Date' bez strefy czasowej, posortowany i bez duplikatów.
+    """
+    if df is None or df.empty:
+        empty = pd.DataFrame(columns=OHLCV_COLUMNS, dtype=float)
+        empty.index = pd.DatetimeIndex([], name='Date')
+        return empty
+
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        # yf.download zwraca kolumny (cena, ticker)
+        df.columns = df.columns.get_level_values(0)
+    df.columns.name = None
+
+    index = pd.to_datetime(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df.index = index
+    df.index.name = 'Date'
+
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    return df[[column for column in OHLCV_COLUMNS if column in df.columns]]
+
+
+class MarketDataProvider:
+    """
+    Wspólny interfejs dostawcy danych rynkowych (notowania + sprawozdania).
+    Konkretne backendy nadpisują poniższe metody.
+    """
+    name = 'base'
+
+    def history(self, ticker, start=None, end=None, period=None):
+        """
+        Zwraca dzienne notowania OHLCV (format z normalize_ohlcv).
+        'start'/'end' to daty 'YYYY-MM-DD' ('end' wyłącznie),
+        'period' to np. '1d', '5y' lub 'max'.
+        """
+        raise NotImplementedError
+
+    def info(self, ticker):
+        """Zwraca słownik z podstawowymi danymi o spółce."""
+        raise NotImplementedError
+
+    def statement(self, ticker, name):
+        """
+        Zwraca sprawozdanie 'name' (jedno z STATEMENTS) jako DataFrame:
+        pozycje w wierszach, daty okresów w kolumnach.
+        """
+        raise NotImplementedError
+
+    def financials(self, ticker):
+        return self.statement(ticker, 'financials')
+
+    def quarterly_financials(self, ticker):
+        return self.statement(ticker, 'quarterly_financials')
+
+    def balance_sheet(self, ticker):
+        return self.statement(ticker, 'balance_sheet')
+
+    def cashflow(self, ticker):
+        return self.statement(ticker, 'cashflow')
+
+
+_provider = None
+
+
+def set_provider(provider):
+    """Ustawia dostawcę danych używanego w całej aplikacji."""
+    global _provider
+    _provider = provider
+
+
+def get_provider():
+    """
+    Zwraca bieżącego dostawcę danych. Domyślny wybierany jest zmienną
+    środowiskową MARKET_DATA_PROVIDER ('yfinance' lub 'replay');
+    katalog z nagraniami dla 'replay' wskazuje MARKET_DATA_DIR.
+    """
+    global _provider
+    if _provider is None:
+        backend = os.environ.get('MARKET_DATA_PROVIDER', 'yfinance').lower()
+        if backend == 'replay':
+            from .replay_provider import ReplayProvider
+            _provider = ReplayProvider(os.environ.get('MARKET_DATA_DIR', 'market_data_recordings'))
+        elif backend == 'yfinance':
+            from .yfinance_provider import YFinanceProvider
+            _provider = YFinanceProvider()
+        else:
+            raise ValueError(f"Unknown market data provider: {backend}")
+    return _provider
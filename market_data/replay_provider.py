@@ -0,0 +1,86 @@
+from .provider import *
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Dostawca odtwarzający wcześniej nagrane dane z dysku (bez sieci).
+    Układ katalogu:
+        <root>/<TICKER>/prices.csv           - notowania OHLCV
+        <root>/<TICKER>/info.json            - słownik info
+        <root>/<TICKER>/<statement>.csv      - sprawozdania (STATEMENTS)
+    """
+    name = 'replay'
+
+    def __init__(self, root):
+        self.root = root
+        self._prices = {}
+
+    def _path(self, ticker, filename):
+        return os.path.join(self.root, ticker, filename)
+
+    def _load_prices(self, ticker):
+        if ticker not in self._prices:
+            path = self._path(ticker, 'prices.csv')
+            if os.path.exists(path):
+                data = pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+            else:
+                data = None
+            self._prices[ticker] = normalize_ohlcv(data)
+        return self._prices[ticker]
+
+    def history(self, ticker, start=None, end=None, period=None):
+        data = self._load_prices(ticker)
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end)]
+        if period is not None and period != 'max' and not data.empty:
+            data = data[data.index > data.index[-1] - _period_offset(period)]
+        return data.copy()
+
+    def info(self, ticker):
+        path = self._path(ticker, 'info.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def statement(self, ticker, name):
+        if name not in STATEMENTS:
+            raise ValueError(f"Unknown statement: {name}")
+        path = self._path(ticker, f'{name}.csv')
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        data = pd.read_csv(path, index_col=0)
+        data.columns = pd.to_datetime(data.columns)
+        return data
+
+
+def _period_offset(period):
+    """Zamienia okres w stylu yfinance ('5d', '6mo', '2y') na pd.DateOffset."""
+    if period.endswith('mo'):
+        return pd.DateOffset(months=int(period[:-2]))
+    if period.endswith('y'):
+        return pd.DateOffset(years=int(period[:-1]))
+    if period.endswith('d'):
+        return pd.DateOffset(days=int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def record(ticker, source, root):
+    """
+    Nagrywa notowania, info i sprawozdania tickera z dostawcy 'source'
+    do katalogu 'root' w formacie czytanym przez ReplayProvider.
+    """
+    directory = os.path.join(root, ticker)
+    os.makedirs(directory, exist_ok=True)
+
+    source.history(ticker).to_csv(os.path.join(directory, 'prices.csv'))
+
+    with open(os.path.join(directory, 'info.json'), 'w', encoding='utf-8') as f:
+        json.dump(source.info(ticker), f, default=str)
+
+    for name in STATEMENTS:
+        data = source.statement(ticker, name)
+        if data is not None and not data.empty:
+            data.to_csv(os.path.join(directory, f'{name}.csv'))
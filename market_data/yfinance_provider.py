@@ -0,0 +1,30 @@
+from .provider import *
+import yfinance as yf
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Dostawca pobierający dane na żywo z Yahoo Finance (yfinance).
+
+    yf.Ticker buforuje pobrane info i sprawozdania przez cały czas życia, więc
+    każde wywołanie tworzy nowy obiekt: ponowne pobranie po upływie TTL
+    (load_company_bundle) dostaje świeże dane, a dostawca nie gromadzi obiektów
+    wszystkich kiedykolwiek analizowanych tickerów.
+    """
+    name = 'yfinance'
+
+    def history(self, ticker, start=None, end=None, period=None):
+        if period is None and start is None:
+            period = 'max'
+        # Ticker.history (w przeciwieństwie do yf.download) nie korzysta ze
+        # współdzielonego stanu modułu, więc można go wołać z wielu wątków
+        data = yf.Ticker(ticker).history(start=start, end=end, period=period)
+        return normalize_ohlcv(data)
+
+    def info(self, ticker):
+        return yf.Ticker(ticker).info or {}
+
+    def statement(self, ticker, name):
+        if name not in STATEMENTS:
+            raise ValueError(f"Unknown statement: {name}")
+        return getattr(yf.Ticker(ticker), name)
@@ -0,0 +1,25 @@
+from .imports import *
+from .linear_model import RidgeWindowModel
+
+# Backendy modeli sektorów: sieć LSTM (TensorFlow) albo regresja ridge (NumPy)
+LSTM, RIDGE = 'lstm', 'ridge'
+BACKENDS = (LSTM, RIDGE)
+
+# Nazwa pliku artefaktu w rejestrze modeli
+ARTIFACTS = {LSTM: 'model.keras', RIDGE: 'model.npz'}
+
+
+def backend_of(model):
+    """Backend, z którego pochodzi model."""
+    return RIDGE if isinstance(model, RidgeWindowModel) else LSTM
+
+
+def artifact_name(model):
+    return ARTIFACTS[backend_of(model)]
+
+
+def load_model(path):
+    """Wczytuje model z artefaktu - backend rozpoznawany po rozszerzeniu pliku."""
+    if path.endswith('.npz'):
+        return RidgeWindowModel.load(path)
+    return tf.keras.models.load_model(path)
@@ -0,0 +1,59 @@
+from .imports import *
+
+
+def window_starts(arrays, window_size, horizon=1):
+    """
+    Skleja macierze cech wielu tickerów w jedną (float32) i zwraca ją razem
+    z indeksami początków wszystkich okien i numerem macierzy źródłowej każdego
+    okna - okna (i ich cele) nie przekraczają granic tickerów.
+    """
+    span = window_size + horizon - 1
+    owners = [i for i, a in enumerate(arrays) if len(a) > span]
+    arrays = [np.asarray(arrays[i], dtype=np.float32) for i in owners]
+    if not arrays:
+        return np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+
+    offsets = np.cumsum([0] + [len(a) for a in arrays[:-1]])
+    starts = np.concatenate([offset + np.arange(len(a) - span, dtype=np.int64)
+                             for offset, a in zip(offsets, arrays)])
+    # Numer macierzy (tickera), z której pochodzi każde okno
+    sources = np.repeat(np.array(owners, dtype=np.int32), [len(a) - span for a in arrays])
+    return np.concatenate(arrays), starts, sources
+
+
+def window_dataset(arrays, window_size, batch_size=32, shuffle=False, seed=None, horizon=1, ids=None):
+    """
+    Strumieniowy tf.data.Dataset paczek (X, y) z okien generowanych w locie
+    (przy horizon > 1 y ma kształt (paczka, horizon)). Przy podanych ids
+    (numer tickera dla każdej macierzy) X to para (okna, numery tickerów).
+
+    W pamięci trzymane są tylko surowe cechy i indeksy początków okien
+    (8 bajtów na okno); tasowane są indeksy, a okna każdej paczki wycinane
+    równolegle przez tf.gather, z prefetchem kolejnych paczek.
+    """
+    values, starts, sources = window_starts(arrays, window_size, horizon)
+    values = tf.constant(values)
+    targets = values[:, 0] if len(starts) else tf.zeros((0,), dtype=tf.float32)
+    offsets = tf.range(window_size, dtype=tf.int64)
+
+    def make_batch(batch_starts, batch_ids=None):
+        X = tf.gather(values, batch_starts[:, None] + offsets[None, :])
+        if horizon == 1:
+            y = tf.gather(targets, batch_starts + window_size)
+        else:
+            steps = tf.range(window_size, window_size + horizon, dtype=tf.int64)
+            y = tf.gather(targets, batch_starts[:, None] + steps[None, :])
+        if batch_ids is not None:
+            return (X, batch_ids), y
+        return X, y
+
+    if ids is None:
+        dataset = tf.data.Dataset.from_tensor_slices(starts)
+    else:
+        dataset = tf.data.Dataset.from_tensor_slices((starts, np.asarray(ids, dtype=np.int32)[sources]))
+    if shuffle:
+        dataset = dataset.shuffle(len(starts), seed=seed, reshuffle_each_iteration=True)
+    return (dataset
+            .batch(batch_size)
+            .map(make_batch, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+            .prefetch(tf.data.AUTOTUNE))
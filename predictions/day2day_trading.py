@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+from .windows import sliding_windows
+from .inference import get_predictor
 
 # Improved predict_next_day function
 def predict_next_day(model, data, window_size):
@@ -11,7 +13,7 @@ def predict_next_day(model, data, window_size):
 
     current_window = data.iloc[-window_size:].values
     input_data = np.reshape(current_window, (1, window_size, current_window.shape[1]))
-    predicted_change = model.predict(input_data)[0][0]
+    predicted_change = get_predictor(model).predict(input_data)[0][0]
 
     if predicted_change > 0:
         return predicted_change, "The stock price will increase tomorrow", "green"
@@ -19,17 +21,21 @@ def predict_next_day(model, data, window_size):
         return predicted_change, "The stock price will decrease tomorrow", "red"
 
 
-def day2day_trading(model, data, window_size, df, initial_balance=1000):
+def day2day_trading(model, data, window_size, df, initial_balance=1000, horizon=20):
     """
     Simulates day-to-day trading with predicted stock movements (buy/sell)
     and portfolio value changes.
 
+    All historical windows are stacked into one batch and predicted with a single
+    model call; the balance path is a cumulative product of daily returns.
+
     Parameters:
     - model: Trained model (e.g., LSTM).
     - data: Input data (pandas DataFrame), where column 0 is the target value.
     - window_size: Window size (number of rows used as input for the model).
     - df: Original DataFrame containing data with a 'Close' column.
     - initial_balance: Initial portfolio value (e.g., 1000).
+    - horizon: Number of most recent trading days to simulate (None: all available days).
 
     Returns:
     - result_df: DataFrame with columns:
@@ -38,44 +44,34 @@ def day2day_trading(model, data, window_size, df, initial_balance=1000):
         - 'Actual_Action': Actual movement (1: Increase, -1: Decrease, 0: No change).
         - 'Balance': Portfolio value after each decision.
     """
-    result_df = pd.DataFrame(columns=['Date', 'Predicted_Action', 'Actual_Action', 'Balance'])
+    columns = ['Date', 'Predicted_Action', 'Actual_Action', 'Balance']
+    available = len(data) - window_size
+    if horizon is None:
+        horizon = available
 
     # Check if there is enough data for trading simulation
-    if len(data) < window_size + 20:
+    if horizon <= 0 or available < horizon:
         print("Not enough data for trading simulation!")
-        return result_df
-
-    # Initialize variables
-    current_balance = initial_balance
-
-    # Loop for 20 trading days
-    for i in range(20, 0, -1):
-        # Prepare the current data window for prediction
-        current_window = data.iloc[-(window_size + i):-i].values
-        input_data = np.reshape(current_window, (1, window_size, current_window.shape[1]))
-
-        # Predict the relative price change
-        predicted_change = model.predict(input_data)[0][0]
+        return pd.DataFrame(columns=columns)
 
-        # Determine predicted action: buy (1), sell (-1), no action (0)
-        predicted_action = 1 if predicted_change > 0 else (-1 if predicted_change < 0 else 0)
+    # Windows ending right before each of the last 'horizon' days (views, no copies)
+    X, actual_changes = sliding_windows(data.to_numpy(), window_size)
+    X, actual_changes = X[-horizon:], actual_changes[-horizon:]
 
-        # Actual price change
-        next_actual_change = data.iloc[-i, 0]
-        actual_action = 1 if next_actual_change > 0 else (-1 if next_actual_change < 0 else 0)
+    # One forward pass for all decision days
+    predicted_changes = np.asarray(get_predictor(model).predict(X)).reshape(len(X), -1)[:, 0]
 
-        # Update portfolio value based on action
-        if predicted_action == 1:  # Buy
-            current_balance *= (1 + next_actual_change)
-        elif predicted_action == -1:  # Sell
-            current_balance *= (1 - next_actual_change)
+    # Buy (1), sell (-1) or no action (0), and the actual movement
+    predicted_action = np.sign(predicted_changes).astype(int)
+    actual_action = np.sign(actual_changes).astype(int)
 
-        # Add results to DataFrame
-        result_df.loc[len(result_df)] = {
-            'Date': df.index[-i],  # Decision date
-            'Predicted_Action': predicted_action,  # Predicted action
-            'Actual_Action': actual_action,  # Actual movement
-            'Balance': current_balance  # Portfolio value
-        }
+    # Buying earns the daily change, selling earns its inverse
+    balance = initial_balance * np.cumprod(1 + predicted_action * actual_changes)
 
-    return result_df
+    dates = df['Date'].iloc[-horizon:].values if 'Date' in df.columns else df.index[-horizon:]
+    return pd.DataFrame({
+        'Date': dates,  # Decision date
+        'Predicted_Action': predicted_action,
+        'Actual_Action': actual_action,
+        'Balance': balance  # Portfolio value
+    })
@@ -0,0 +1,99 @@
+from .imports import *
+from .windows import sliding_windows
+from .inference import get_predictor
+from .backends import backend_of
+import time
+
+
+def held_out_windows(features, window_size, test_split):
+    """
+    Okna walk-forward dla każdego dnia części testowej (jak w create_lstm_data):
+    dzień t oceniamy na oknie z dni t-window_size..t-1, które może sięgać do
+    końca części treningowej. Zwraca (X, y, indeksy dni docelowych).
+    """
+    features = np.asarray(features)
+    train_size = int(len(features) * test_split)
+    X, y = sliding_windows(features, window_size)
+    target_index = np.arange(window_size, len(features))
+    held_out = target_index >= train_size
+    return X[held_out], y[held_out], target_index[held_out]
+
+
+def batched_predict(model, X, batch_size=1024):
+    """Predykcje dla wszystkich okien paczkami (pierwsza kolumna wyjścia modelu)."""
+    predictor = get_predictor(model)
+    outputs = [np.asarray(predictor.predict(X[i:i + batch_size])).reshape(len(X[i:i + batch_size]), -1)[:, 0]
+               for i in range(0, len(X), batch_size)]
+    return np.concatenate(outputs) if outputs else np.empty(0)
+
+
+def score_predictions(predicted, actual):
+    """
+    Metryki prognoz dziennych zmian: trafność kierunku, MAE, wynik strategii
+    long/short z day2day_trading i jej maksymalne obsunięcie kapitału.
+    """
+    predicted = np.asarray(predicted, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    if len(actual) == 0:
+        return {'days': 0, 'hit_rate': None, 'mae': None, 'strategy_return': None,
+                'buy_and_hold_return': None, 'max_drawdown': None}
+
+    equity = np.cumprod(1 + np.sign(predicted) * actual)
+    drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0)) - 1
+    return {
+        'days': int(len(actual)),
+        'hit_rate': float(np.mean(np.sign(predicted) == np.sign(actual))),
+        'mae': float(np.mean(np.abs(predicted - actual))),
+        'strategy_return': float(equity[-1] - 1),
+        'buy_and_hold_return': float(np.prod(1 + actual) - 1),
+        'max_drawdown': float(drawdown.min()),
+    }
+
+
+def evaluate_model(model, features, window_size, test_split, batch_size=1024):
+    """
+    Ocena walk-forward modelu na całej części testowej danych jednego tickera.
+    inference_ms - łączny czas predykcji (do porównania backendów: trafność na milisekundę).
+    """
+    X, y, _ = held_out_windows(features, window_size, test_split)
+    start = time.perf_counter()
+    predicted = batched_predict(model, X, batch_size)
+    inference_ms = (time.perf_counter() - start) * 1000
+    return {**score_predictions(predicted, y), 'inference_ms': inference_ms}
+
+
+def evaluate_sectors(predictor):
+    """Ocena wszystkich załadowanych modeli predyktora - DataFrame, wiersz na sektor."""
+    rows = []
+    for sector, model in predictor.models.items():
+        entry = predictor.model_versions.get(sector) or {}
+        rows.append({
+            'Sector': sector,
+            'Ticker': predictor.sectors[sector],
+            'Backend': backend_of(model),
+            'Fingerprint': entry.get('fingerprint'),
+            **evaluate_model(model, predictor.feature_arrays[sector], predictor.window_size, predictor.test_split),
+        })
+    return pd.DataFrame(rows)
+
+
+def evaluate_registry_versions(predictor, sector):
+    """
+    Ocena wszystkich wersji modelu sektora (albo modelu wspólnego, przypiętego
+    do tickera sektora) z rejestru na tej samej (bieżącej) części testowej -
+    DataFrame, wiersz na wersję, od najnowszej.
+    """
+    registry = predictor.model_registry
+    spec = predictor.shared_model_spec() if predictor.shared else predictor.model_spec(sector)
+    rows = []
+    for entry in registry.versions(spec):
+        model = registry.load(entry)
+        if predictor.shared:
+            model = predictor.bind_shared_model(sector, model, entry)
+        rows.append({
+            'Fingerprint': entry['fingerprint'],
+            'Data cutoff': entry['spec'].get('data_cutoff'),
+            'Validation loss': entry.get('metrics', {}).get('val_loss'),
+            **evaluate_model(model, predictor.feature_arrays[sector], predictor.window_size, predictor.test_split),
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,123 @@
+from .imports import *
+import json
+import pickle
+import hashlib
+import tempfile
+
+# Kolumny cech wejściowych modelu (kolumna 0 jest jednocześnie celem)
+FEATURE_COLUMNS = ['Rel_Close', 'MA_50', 'MA_200', 'Daily_Range_%',
+                   'Open_High_%', 'Open_Low_%', 'RSI']
+
+# Zwiększamy przy każdej zmianie sposobu liczenia cech - stare pliki przestają pasować
+FEATURE_VERSION = 1
+
+DEFAULT_FEATURE_STORE_DIR = os.environ.get('FEATURE_STORE_DIR', os.path.join('.cache', 'features'))
+
+
+class FeatureStore:
+    """
+    Dyskowy magazyn macierzy cech (float32), czytanych przez memmap.
+    Klucz: ticker + wersja cech; plik jest ważny, dopóki nie zmienią się dane źródłowe.
+    Wiele procesów może współdzielić jedną kopię danych w pamięci podręcznej systemu.
+    """
+    def __init__(self, root=DEFAULT_FEATURE_STORE_DIR, version=FEATURE_VERSION):
+        self.root = root
+        self.version = version
+
+    def _paths(self, ticker):
+        base = os.path.join(self.root, f"v{self.version}", ticker)
+        return base + '.features.npy', base + '.dates.npy', base + '.json'
+
+    def _state_path(self, ticker):
+        return os.path.join(self.root, f"v{self.version}", ticker + '.state.pkl')
+
+    @staticmethod
+    def source_hash(df):
+        """Skrót surowych notowań (daty + OHLC), z których liczone są cechy."""
+        digest = hashlib.sha256()
+        digest.update(df['Date'].to_numpy(dtype='datetime64[ns]').tobytes())
+        digest.update(np.ascontiguousarray(df[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64)).tobytes())
+        return digest.hexdigest()
+
+    def _meta(self, ticker):
+        meta_path = self._paths(ticker)[2]
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta if meta.get('columns') == FEATURE_COLUMNS else None
+
+    def load(self, ticker, source_hash):
+        """
+        Zwraca (cechy, daty) jako tablice mapowane z dysku (tylko do odczytu)
+        albo None, jeśli brak pliku lub powstał z innych danych źródłowych.
+        """
+        features_path, dates_path, _ = self._paths(ticker)
+        meta = self._meta(ticker)
+        if meta is None or meta.get('source_hash') != source_hash:
+            return None
+        try:
+            features = np.load(features_path, mmap_mode='r')
+            dates = np.load(dates_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        return features, dates
+
+    def load_latest(self, ticker):
+        """
+        Ostatnio zapisane (cechy, daty, stan IndicatorEngine) niezależnie od danych
+        źródłowych - do doliczenia cech nowych słupków. None, jeśli brak stanu
+        albo nie pasuje on do zapisanych cech.
+        """
+        meta = self._meta(ticker)
+        state = self.load_state(ticker)
+        if meta is None or state is None or state.source_hash != meta.get('source_hash'):
+            return None
+        features = self.load(ticker, meta['source_hash'])
+        return None if features is None else (*features, state)
+
+    def load_state(self, ticker):
+        try:
+            with open(self._state_path(ticker), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def save(self, ticker, features, dates, source_hash, state=None):
+        """
+        Zapisuje atomowo macierz cech (float32), daty wierszy i opcjonalnie stan
+        IndicatorEngine, od którego można kontynuować liczenie cech.
+        """
+        features_path, dates_path, meta_path = self._paths(ticker)
+        os.makedirs(os.path.dirname(features_path), exist_ok=True)
+
+        _atomic_save(features_path, np.ascontiguousarray(features, dtype=np.float32))
+        _atomic_save(dates_path, np.asarray(dates, dtype='datetime64[ns]'))
+        if state is not None:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(meta_path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._state_path(ticker))
+        meta = {
+            'ticker': ticker,
+            'version': self.version,
+            'columns': FEATURE_COLUMNS,
+            'rows': int(len(features)),
+            'source_hash': source_hash,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(meta_path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        # Metadane zapisujemy na końcu - dopiero one "publikują" nowe pliki
+        os.replace(tmp_path, meta_path)
+
+
+def _atomic_save(path, array):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.npy')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,260 @@
+from .imports import *
+from .windows import WindowBatches, sliding_windows
+from .evaluation import score_predictions
+from .backends import RIDGE
+from .linear_model import RidgeWindowModel
+from .parallel_training import _init_worker
+import json
+import math
+import time
+import shutil
+import tempfile
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Zwycięskie konfiguracje sektorów - czytane przez usługę predykcji zamiast stałych ze stron
+BEST_CONFIG_PATH = os.environ.get('HYPERPARAMETERS_FILE', os.path.join('models', 'hyperparameters.json'))
+
+HYPERPARAMETERS = ('window_size', 'epochs', 'batch_size', 'test_split')
+
+DEFAULT_SEARCH_SPACE = {
+    'window_size': [30, 50, 80],
+    'epochs': [5, 10],
+    'batch_size': [32, 64],
+    'test_split': [0.9, 0.95],
+}
+
+# Okna (float32, ciągłe w pamięci) per (plik cech, rozmiar okna, horyzont) - w obrębie procesu roboczego
+_window_cache = {}
+
+
+def search_configs(space=None):
+    """Wszystkie kombinacje przestrzeni poszukiwań jako lista słowników."""
+    space = space or DEFAULT_SEARCH_SPACE
+    return [dict(zip(HYPERPARAMETERS, values)) for values in itertools.product(*(space[name] for name in HYPERPARAMETERS))]
+
+
+def cached_windows(features_path, window_size, horizon=1):
+    """
+    Okna i cele dla całej macierzy cech - budowane raz na proces dla danego
+    rozmiaru okna i horyzontu; próby różniące się pozostałymi parametrami tylko je wycinają.
+    """
+    key = (features_path, window_size, horizon)
+    if key not in _window_cache:
+        X, y = sliding_windows(np.load(features_path, mmap_mode='r'), window_size, horizon)
+        _window_cache[key] = (np.ascontiguousarray(X, dtype=np.float32), np.ascontiguousarray(y, dtype=np.float32))
+    return _window_cache[key]
+
+
+def _run_trial(trial):
+    """
+    Trenuje model jednej konfiguracji (z wczesnym zatrzymaniem) i ocenia go na
+    wspólnym dla wszystkich prób końcowym odcinku danych (holdout_split).
+    Backend i horyzont są te same co w aplikacji, a próba nie widzi holdoutu:
+    trenuje i zatrzymuje się na danych przed nim, dzielonych wg własnego test_split.
+    """
+    from .stock_prediction import StockPrediction
+
+    config = trial['config']
+    window_size, horizon = config['window_size'], trial['horizon']
+    X, y = cached_windows(trial['features_path'], window_size, horizon)
+    span = window_size + horizon - 1
+    rows = len(X) + span
+
+    # Okna wg położenia celów: treningowe - wszystkie cele przed train_rows,
+    # walidacyjne - cele w [train_rows, holdout_rows), holdout - cele od holdout_rows
+    holdout_rows = int(rows * trial['holdout_split'])
+    train_rows = int(holdout_rows * config['test_split'])
+    train_end = max(train_rows - span, 0)
+    validation = slice(max(train_rows - window_size, 0), max(holdout_rows - span, 0))
+    holdout = slice(max(holdout_rows - window_size, 0), len(X))
+    train_X, train_y = X[:train_end], y[:train_end]
+    validation_X, validation_y = X[validation], y[validation]
+    holdout_X, holdout_y = X[holdout], y[holdout]
+    if len(train_X) == 0 or len(validation_X) == 0 or len(holdout_X) == 0:
+        raise ValueError(f"Not enough data for window size {window_size} and horizon {horizon}")
+
+    start = time.time()
+    if trial['backend'] == RIDGE:
+        # Rozwiązanie w postaci zamkniętej - bez epok i wczesnego zatrzymania
+        model = RidgeWindowModel(trial['ridge_alpha']).fit(train_X, train_y)
+        epochs_completed = 0
+        val_loss = float(np.mean((model.predict(validation_X).reshape(len(validation_X), -1)
+                                  - validation_y.reshape(len(validation_X), -1)) ** 2))
+    else:
+        predictor = StockPrediction({trial['sector']: trial['ticker']}, **config, horizon=horizon)
+        model = predictor.build_model((window_size, X.shape[2]), horizon)
+        stop = tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=trial['patience'],
+                                                restore_best_weights=True)
+        history = model.fit(WindowBatches(train_X, train_y, config['batch_size'], shuffle=True, seed=trial['seed']),
+                            epochs=trial['budget'],
+                            validation_data=WindowBatches(validation_X, validation_y, config['batch_size']),
+                            callbacks=[stop], verbose=0)
+        epochs_completed = len(history.history['loss'])
+        val_loss = float(min(history.history['val_loss']))
+
+    # Błąd po wszystkich dniach horyzontu; trafność i strategia - dla prognozy na następny dzień
+    predicted = np.asarray(model.predict(holdout_X, batch_size=1024, verbose=0)).reshape(len(holdout_X), -1)
+    actual = holdout_y.reshape(len(holdout_X), -1)
+    scores = score_predictions(predicted[:, 0], actual[:, 0])
+    return {
+        'sector': trial['sector'],
+        'ticker': trial['ticker'],
+        **config,
+        'horizon': horizon,
+        'backend': trial['backend'],
+        'budget': trial['budget'],
+        'epochs_completed': epochs_completed,
+        'val_loss': val_loss,
+        'holdout_mse': float(np.mean((predicted - actual) ** 2)),
+        'hit_rate': scores['hit_rate'],
+        'strategy_return': scores['strategy_return'],
+        'train_seconds': time.time() - start,
+    }
+
+
+def _run_trials(trials, executor, progress, stage):
+    results, errors = [], []
+    futures = {executor.submit(_run_trial, trial): trial for trial in trials}
+    for done, future in enumerate(as_completed(futures), start=1):
+        trial = futures[future]
+        error = None
+        try:
+            results.append(future.result())
+        except Exception as e:
+            error = e
+            errors.append({'sector': trial['sector'], **trial['config'], 'error': str(e)})
+            print(f"[WARN] Trial {trial['config']} for {trial['sector']} failed: {e}")
+        if progress is not None:
+            progress(stage, done, len(trials), error)
+    return results, errors
+
+
+def run_search(predictor, space=None, max_workers=None, threads_per_worker=None, rung_epochs=2,
+               keep_fraction=1 / 3, patience=2, seed=0, path=BEST_CONFIG_PATH, progress=None, horizon=None):
+    """
+    Przeszukuje konfiguracje dla wszystkich sektorów predyktora (z przygotowanymi
+    cechami) w równoległych procesach i zapisuje zwycięzców do pliku JSON.
+
+    Przycinanie (successive halving): najpierw każda konfiguracja trenuje tylko
+    rung_epochs epok, a pełny budżet epok dostaje keep_fraction najlepszych
+    na sektor. Każdy trening ma też wczesne zatrzymanie (patience epok bez poprawy).
+    Próby porównywane są na wspólnym końcowym odcinku danych (najmniejsza część
+    testowa z przestrzeni), więc różne test_split nie zaburzają porównania;
+    wczesne zatrzymanie korzysta z odcinka walidacyjnego kończącego się przed nim.
+    Modele mają backend sektora i horyzont predyktora (albo podany horizon) -
+    tak jak modele, które później zbuduje z tych konfiguracji aplikacja.
+
+    :param progress: opcjonalne progress(etap, done, total, error)
+    :return: DataFrame wszystkich ukończonych prób (etap 'rung' / 'full')
+    """
+    configs = search_configs(space)
+    horizon = horizon or predictor.horizon
+    holdout_split = max(config['test_split'] for config in configs)
+    sectors = [sector for sector in predictor.feature_arrays if sector in predictor.sectors]
+
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(max_workers or cpus, len(configs) * max(len(sectors), 1)))
+    threads = threads_per_worker or max(1, cpus // workers)
+
+    work_dir = tempfile.mkdtemp(prefix='hyperparameter-search-')
+    try:
+        # Cechy trafiają do plików .npy - procesy robocze czytają je przez memmap
+        paths = {}
+        for sector in sectors:
+            paths[sector] = os.path.join(work_dir, f"{predictor.sectors[sector]}.npy")
+            np.save(paths[sector], np.asarray(predictor.feature_arrays[sector], dtype=np.float32))
+
+        def trials_for(pairs, budget_of):
+            # Kolejność wg (sektor, okno) - kolejne próby w procesie trafiają w pamięć okien
+            pairs = sorted(pairs, key=lambda pair: (pair[0], pair[1]['window_size']))
+            return [{
+                'sector': sector,
+                'ticker': predictor.sectors[sector],
+                'features_path': paths[sector],
+                'config': config,
+                'horizon': horizon,
+                'backend': predictor.backend_for(sector),
+                'ridge_alpha': predictor.ridge_alpha,
+                'budget': budget_of(config),
+                'patience': patience,
+                'holdout_split': holdout_split,
+                'seed': seed,
+            } for sector, config in pairs]
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(threads,)) as executor:
+            rung, _ = _run_trials(trials_for([(s, c) for s in sectors for c in configs],
+                                             lambda config: min(rung_epochs, config['epochs'])),
+                                  executor, progress, 'rung')
+
+            survivors = []
+            for sector in sectors:
+                ranked = sorted((r for r in rung if r['sector'] == sector), key=lambda r: r['holdout_mse'])
+                keep = ranked[:max(1, math.ceil(len(ranked) * keep_fraction))]
+                survivors += [(sector, {name: r[name] for name in HYPERPARAMETERS}) for r in keep]
+
+            full, _ = _run_trials(trials_for(survivors, lambda config: config['epochs']), executor, progress, 'full')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = pd.DataFrame([{**r, 'stage': 'rung'} for r in rung] + [{**r, 'stage': 'full'} for r in full])
+    if not full:
+        return results
+
+    best = {}
+    for sector in sectors:
+        finished = [r for r in full if r['sector'] == sector]
+        if finished:
+            winner = min(finished, key=lambda r: r['holdout_mse'])
+            best[sector] = {
+                'ticker': winner['ticker'],
+                **{name: winner[name] for name in HYPERPARAMETERS},
+                'horizon': winner['horizon'],
+                'backend': winner['backend'],
+                'holdout_mse': winner['holdout_mse'],
+                'hit_rate': winner['hit_rate'],
+                'searched_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+    save_best_configs(best, path)
+    return results
+
+
+def load_best_configs(path=BEST_CONFIG_PATH):
+    """Zwycięskie konfiguracje {sektor: {ticker, window_size, epochs, batch_size, test_split, horizon, backend, ...}} albo {}."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_best_configs(best, path=BEST_CONFIG_PATH):
+    """Dopisuje (nadpisuje) konfiguracje sektorów w pliku JSON - zapis atomowy."""
+    configs = {**load_best_configs(path), **best}
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(configs, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    print(f"[INFO] Saved hyperparameters for {len(best)} sectors to {path}")
+
+
+if __name__ == '__main__':
+    from .stock_prediction import StockPrediction
+    from .prediction_service import DEFAULT_SECTORS, DEFAULT_HORIZON
+
+    search_predictor = StockPrediction(DEFAULT_SECTORS, horizon=DEFAULT_HORIZON)
+    search_predictor.download_data()
+    search_predictor.preprocess_features()
+    trials = run_search(search_predictor, progress=lambda stage, done, total, error:
+                        print(f"[INFO] {stage}: {done}/{total} trials"))
+    print(trials.sort_values(['sector', 'stage', 'holdout_mse']).to_string(index=False))
@@ -1,8 +1,8 @@
 import os
 import numpy as np
 import pandas as pd
-import yfinance as yf
+from market_data import get_provider, BarStore, download_many
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
+from tensorflow.keras.layers import LSTM, Dense, Dropout, Embedding, RepeatVector, Concatenate
 from tensorflow.keras import Input
\ No newline at end of file
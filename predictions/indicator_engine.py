@@ -0,0 +1,154 @@
+import math
+from collections import deque
+import numpy as np
+
+
+class RollingMean:
+    """
+    Średnia krocząca z oknem 'window' aktualizowana w O(1). Suma bieżąca jest
+    kompensowana (Neumaier), więc po tysiącach dodawań i odejmowań nie dryfuje
+    względem średniej liczonej od zera.
+    """
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def _add(self, x):
+        total = self.total + x
+        if abs(self.total) >= abs(x):
+            self.compensation += (self.total - total) + x
+        else:
+            self.compensation += (x - total) + self.total
+        self.total = total
+
+    def update(self, x):
+        self.values.append(x)
+        self._add(x)
+        if len(self.values) > self.window:
+            self._add(-self.values.popleft())
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window:
+            return math.nan
+        return (self.total + self.compensation) / self.window
+
+    def preview(self, x):
+        """Średnia po dodaniu x - bez zmiany stanu."""
+        if len(self.values) < self.window - 1:
+            return math.nan
+        dropped = self.values[0] if len(self.values) == self.window else 0.0
+        return (self.total + self.compensation + x - dropped) / self.window
+
+
+class WilderMean:
+    """
+    Średnia Wildera: pierwsza wartość to zwykła średnia z 'period' obserwacji,
+    kolejne avg = (avg * (period - 1) + x) / period.
+    """
+    def __init__(self, period):
+        self.period = period
+        self.seed = RollingMean(period)
+        self.average = math.nan
+
+    def update(self, x):
+        self.average = self.preview(x)
+        if math.isnan(self.average):
+            self.seed.update(x)
+        return self.average
+
+    @property
+    def value(self):
+        return self.average
+
+    def preview(self, x):
+        if math.isnan(self.average):
+            return self.seed.preview(x)
+        return (self.average * (self.period - 1) + x) / self.period
+
+
+class IndicatorEngine:
+    """
+    Przyrostowe liczenie cech modelu (FEATURE_COLUMNS) - O(1) na nowy słupek,
+    z tymi samymi wartościami co StockPrediction.compute_features:
+    Rel_Close, MA_50, MA_200 (względem poprzedniego zamknięcia), zakresy dzienne
+    i RSI (rsi_method='simple' - średnie kroczące jak compute_rsi, albo 'wilder').
+
+    Stan (okna, sumy, ostatnie zamknięcie) można zapisać przez pickle i po
+    dociągnięciu nowych notowań kontynuować od miejsca, w którym skończono.
+    """
+    def __init__(self, rsi_period=14, rsi_method='simple'):
+        if rsi_method not in ('simple', 'wilder'):
+            raise ValueError(f"Unknown RSI method: {rsi_method}")
+        self.rsi_method = rsi_method
+        self.prev_close = None
+        self.ma_50 = RollingMean(50)
+        self.ma_200 = RollingMean(200)
+        average = WilderMean if rsi_method == 'wilder' else RollingMean
+        self.gains = average(rsi_period)
+        self.losses = average(rsi_period)
+        self.rows = 0
+        # Data ostatniego słupka i skrót przetworzonych notowań (do kontynuacji)
+        self.last_date = None
+        self.source_hash = None
+
+    def _features(self, open_, high, low, close, ma_50, ma_200, gain, loss):
+        prev = self.prev_close
+        rel_close = close / prev - 1 if prev is not None else math.nan
+        rs = gain / (loss + 1e-9)
+        return np.array([
+            rel_close,
+            ma_50 / prev - 1 if prev is not None else math.nan,
+            ma_200 / prev - 1 if prev is not None else math.nan,
+            (high - low) / low,
+            (high - open_) / open_,
+            (open_ - low) / open_,
+            100 - (100 / (1 + rs)),
+        ])
+
+    def _delta(self, close):
+        # Pierwszy słupek ma zmianę 0 (jak diff().fillna(0) w compute_rsi)
+        delta = close - self.prev_close if self.prev_close is not None else 0.0
+        return max(delta, 0.0), max(-delta, 0.0)
+
+    def update(self, open_, high, low, close):
+        """Dodaje zamknięty słupek i zwraca wiersz cech (NaN, dopóki wskaźniki się nie rozgrzeją)."""
+        gain, loss = self._delta(close)
+        row = self._features(open_, high, low, close, self.ma_50.update(close), self.ma_200.update(close),
+                             self.gains.update(gain), self.losses.update(loss))
+        self.prev_close = close
+        self.rows += 1
+        return row
+
+    def preview(self, open_, high, low, close):
+        """
+        Cechy dla niezamkniętego słupka (np. notowania w trakcie sesji) bez
+        zmiany stanu - każde kolejne odświeżenie kosztuje O(1).
+        """
+        gain, loss = self._delta(close)
+        return self._features(open_, high, low, close, self.ma_50.preview(close), self.ma_200.preview(close),
+                              self.gains.preview(gain), self.losses.preview(loss))
+
+    @property
+    def ready(self):
+        """Czy kolejne wiersze będą już kompletne (jak po dropna w ścieżce wsadowej)."""
+        return self.prev_close is not None and not math.isnan(self.ma_200.value) and not math.isnan(self.gains.value)
+
+    def run(self, df):
+        """
+        Przetwarza kolejne słupki df (kolumny Date, Open, High, Low, Close).
+        Zwraca (cechy kompletnych wierszy, ich daty).
+        """
+        rows = [self.update(o, h, l, c) for o, h, l, c in
+                df[['Open', 'High', 'Low', 'Close']].itertuples(index=False, name=None)]
+        dates = df['Date'].to_numpy(dtype='datetime64[ns]')
+        if len(dates):
+            self.last_date = dates[-1]
+        if not rows:
+            return np.empty((0, 7)), dates[:0]
+        rows = np.vstack(rows)
+        complete = ~np.isnan(rows).any(axis=1)
+        return rows[complete], dates[complete]
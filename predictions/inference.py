@@ -0,0 +1,86 @@
+from .imports import *
+import time
+import weakref
+from collections import deque
+
+# Jeden skompilowany predyktor na model. Predyktor trzyma model tylko przez
+# słabą referencję, więc wpis (i jego graf) znika razem z modelem.
+_predictors = weakref.WeakKeyDictionary()
+
+
+class CompiledPredictor:
+    """
+    Szybka ścieżka inferencji dla modelu Keras: tf.function o stałej sygnaturze
+    (None, okno, cechy) zamiast model.predict, który przy każdym wywołaniu
+    buduje od nowa potok danych. Zapamiętuje czasy wywołań. Przy ticker_id
+    obsługuje model wspólny (wejścia: okno i numer tickera).
+    """
+    def __init__(self, model, history=1000, ticker_id=None):
+        self._model = weakref.ref(model)
+        model_ref = self._model
+        input_shape = model.input_shape if ticker_id is None else model.input_shape[0]
+        signature = [tf.TensorSpec((None,) + tuple(input_shape[1:]), tf.float32)]
+        if ticker_id is None:
+            forward = lambda x: model_ref()(x, training=False)
+        else:
+            # Model wspólny wielu tickerów: numer tickera dokładany do każdego okna
+            forward = lambda x: model_ref()([x, tf.fill(tf.shape(x)[:1], tf.constant(ticker_id, tf.int32))],
+                                            training=False)
+        self._forward = tf.function(forward, input_signature=signature, reduce_retracing=True)
+        self.latencies = deque(maxlen=history)
+
+    @property
+    def model(self):
+        return self._model()
+
+    def predict(self, x, **kwargs):
+        """Ten sam kontrakt co model.predict: tablica wejść -> tablica NumPy z wynikami."""
+        start = time.perf_counter()
+        result = self._forward(tf.convert_to_tensor(np.asarray(x, dtype=np.float32))).numpy()
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+    def latency_stats(self):
+        """Liczba wywołań oraz średni / p50 / p95 czas pojedynczego wywołania (ms)."""
+        if not self.latencies:
+            return {'calls': 0, 'mean_ms': None, 'p50_ms': None, 'p95_ms': None}
+        values = np.array(self.latencies) * 1000
+        return {
+            'calls': len(values),
+            'mean_ms': float(values.mean()),
+            'p50_ms': float(np.percentile(values, 50)),
+            'p95_ms': float(np.percentile(values, 95)),
+        }
+
+
+def get_predictor(model):
+    """
+    Zwraca (i zapamiętuje) skompilowany predyktor dla modelu Keras.
+    Obiekty, które nie są modelami Keras, zwracane są bez zmian.
+    """
+    if isinstance(model, CompiledPredictor) or not isinstance(model, tf.keras.Model):
+        return model
+    predictor = _predictors.get(model)
+    if predictor is None:
+        predictor = CompiledPredictor(model)
+        _predictors[model] = predictor
+    return predictor
+
+
+def output_width(model):
+    """Liczba wartości zwracanych przez model dla jednego okna (1 albo horyzont prognozy)."""
+    model = getattr(model, 'model', model)
+    shape = getattr(model, 'output_shape', None)
+    return int(shape[-1]) if shape and shape[-1] else 1
+
+
+def format_latency(model):
+    """Krótki opis czasów inferencji do wyświetlenia pod wynikami."""
+    predictor = get_predictor(model)
+    if not hasattr(predictor, 'latency_stats'):
+        return None
+    stats = predictor.latency_stats()
+    if not stats['calls']:
+        return None
+    return (f"Inference: {stats['calls']} calls, mean {stats['mean_ms']:.2f} ms, "
+            f"p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms per call")
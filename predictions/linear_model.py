@@ -0,0 +1,84 @@
+import time
+from collections import deque
+import numpy as np
+
+
+class RidgeWindowModel:
+    """
+    Regresja grzbietowa (ridge) na spłaszczonych oknach cech - lekka, czysto
+    NumPy-owa alternatywa dla LSTM. Ten sam kontrakt co model Keras:
+    predict(okna (n, okno, cechy)) -> tablica (n, wyjścia).
+
+    Cechy są standaryzowane wewnątrz rozwiązania (kara alpha względem wariancji
+    cechy), a macierze X^T X składane paczkami, więc okna nie są materializowane naraz.
+    """
+    def __init__(self, alpha=1.0, history=1000):
+        self.alpha = alpha
+        self.coef = None
+        self.intercept = None
+        self.input_shape = None
+        self.latencies = deque(maxlen=history)
+
+    def fit(self, X, y, chunk_size=4096):
+        """Dopasowanie w postaci zamkniętej; X - okna (n, okno, cechy), y - (n,) lub (n, wyjścia)."""
+        n = len(X)
+        if n == 0:
+            raise ValueError("No training windows")
+        y = np.asarray(y, dtype=np.float64).reshape(n, -1)
+        dim = int(np.prod(X.shape[1:]))
+
+        xtx = np.zeros((dim, dim))
+        xty = np.zeros((dim, y.shape[1]))
+        x_sum = np.zeros(dim)
+        for i in range(0, n, chunk_size):
+            chunk = np.asarray(X[i:i + chunk_size], dtype=np.float64).reshape(-1, dim)
+            xtx += chunk.T @ chunk
+            xty += chunk.T @ y[i:i + chunk_size]
+            x_sum += chunk.sum(axis=0)
+
+        x_mean = x_sum / n
+        y_mean = y.mean(axis=0)
+        cov = xtx / n - np.outer(x_mean, x_mean)
+        cross = xty / n - np.outer(x_mean, y_mean)
+        penalty = self.alpha * np.diag(cov).clip(min=1e-12)
+        self.coef = np.linalg.solve(cov + np.diag(penalty), cross)
+        self.intercept = y_mean - x_mean @ self.coef
+        self.input_shape = (None,) + tuple(X.shape[1:])
+        return self
+
+    @property
+    def output_shape(self):
+        return (None, None if self.coef is None else self.coef.shape[1])
+
+    def predict(self, x, **kwargs):
+        start = time.perf_counter()
+        x = np.asarray(x, dtype=np.float64)
+        result = (x.reshape(len(x), -1) @ self.coef + self.intercept).astype(np.float32)
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+    def latency_stats(self):
+        """Liczba wywołań oraz średni / p50 / p95 czas pojedynczego wywołania (ms)."""
+        if not self.latencies:
+            return {'calls': 0, 'mean_ms': None, 'p50_ms': None, 'p95_ms': None}
+        values = np.array(self.latencies) * 1000
+        return {
+            'calls': len(values),
+            'mean_ms': float(values.mean()),
+            'p50_ms': float(np.percentile(values, 50)),
+            'p95_ms': float(np.percentile(values, 95)),
+        }
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            np.savez(f, alpha=self.alpha, coef=self.coef, intercept=self.intercept,
+                     input_shape=np.array(self.input_shape[1:]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            model = cls(alpha=float(data['alpha']))
+            model.coef = data['coef']
+            model.intercept = data['intercept']
+            model.input_shape = (None,) + tuple(int(v) for v in data['input_shape'])
+        return model
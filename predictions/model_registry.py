@@ -0,0 +1,142 @@
+from .imports import *
+from .backends import load_model
+import json
+import time
+import uuid
+import shutil
+import hashlib
+
+DEFAULT_REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR', 'models')
+
+# Pola opisu modelu, które nie zmieniają jego "rodziny" (wersje tej samej linii)
+VERSION_FIELDS = ('data_cutoff',)
+
+
+def fingerprint(spec):
+    """Skrót opisu modelu (ticker, cechy, okno, hiperparametry, data odcięcia danych)."""
+    payload = json.dumps(spec, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def lineage(spec):
+    """Skrót opisu bez daty odcięcia - wspólny dla kolejnych wersji tego samego modelu."""
+    return fingerprint({key: value for key, value in spec.items() if key not in VERSION_FIELDS})
+
+
+class ModelRegistry:
+    """
+    Rejestr wytrenowanych modeli na dysku:
+        <root>/<ticker>/<lineage>/<fingerprint>/{model.keras | model.npz, meta.json}
+    Artefakty zapisywane są atomowo (katalog tymczasowy + rename), więc wiele
+    procesów aplikacji może bezpiecznie korzystać z tego samego rejestru.
+    """
+    def __init__(self, root=DEFAULT_REGISTRY_DIR, keep_versions=3):
+        self.root = root
+        self.keep_versions = keep_versions
+
+    def _lineage_dir(self, spec):
+        return os.path.join(self.root, str(spec.get('ticker', '_')), lineage(spec))
+
+    def _read_entry(self, directory):
+        meta_path = os.path.join(directory, 'meta.json')
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry['path'] = directory
+        return entry
+
+    def versions(self, spec):
+        """Wszystkie wersje z tej samej linii, od najnowszej."""
+        directory = self._lineage_dir(spec)
+        if not os.path.isdir(directory):
+            return []
+        entries = [self._read_entry(os.path.join(directory, name)) for name in os.listdir(directory)]
+        entries = [entry for entry in entries if entry is not None]
+        return sorted(entries, key=lambda e: (e['spec'].get('data_cutoff') or '', e['trained_at']), reverse=True)
+
+    def find(self, spec):
+        """Artefakt dokładnie pasujący do opisu albo None."""
+        return self._read_entry(os.path.join(self._lineage_dir(spec), fingerprint(spec)))
+
+    def latest(self, spec):
+        """Najnowsza wersja z linii (ten sam ticker, cechy, okno i hiperparametry) albo None."""
+        versions = self.versions(spec)
+        return versions[0] if versions else None
+
+    def lookup(self, spec, max_cutoff_age=0):
+        """
+        Artefakt dokładnie pasujący do opisu, a gdy go brak i max_cutoff_age > 0 -
+        najnowsza wersja linii, której dane kończą się najwyżej max_cutoff_age dni
+        przed datą odcięcia z opisu. None, jeśli żaden nie pasuje.
+        """
+        entry = self.find(spec)
+        if entry is not None or not max_cutoff_age:
+            return entry
+        entry = self.latest(spec)
+        if entry is None:
+            return None
+        age = (pd.Timestamp(spec['data_cutoff']) - pd.Timestamp(entry['spec']['data_cutoff'])).days
+        return entry if 0 <= age <= max_cutoff_age else None
+
+    def register(self, spec, save, metrics=None, artifact='model.keras'):
+        """
+        Zapisuje nowy artefakt: save(ścieżka) zapisuje model, a rejestr dokłada
+        meta.json i publikuje całość atomowo. Istniejący artefakt o tym samym
+        fingerprincie (np. po wymuszonym retreningu) jest zastępowany; jeśli inny
+        proces opublikuje go w międzyczasie, zostaje jego wersja.
+        """
+        final_dir = os.path.join(self._lineage_dir(spec), fingerprint(spec))
+        tmp_dir = os.path.join(self.root, '.tmp', uuid.uuid4().hex)
+        os.makedirs(tmp_dir)
+        try:
+            save(os.path.join(tmp_dir, artifact))
+            meta = {
+                'fingerprint': fingerprint(spec),
+                'lineage': lineage(spec),
+                'spec': spec,
+                'artifact': artifact,
+                'trained_at': time.time(),
+                'metrics': metrics or {},
+            }
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, default=str, indent=2)
+
+            os.makedirs(os.path.dirname(final_dir), exist_ok=True)
+            # Stara wersja jest tylko odsuwana (rename), a usuwana dopiero po
+            # opublikowaniu nowej - równoległy odczyt nie trafi na częściowo skasowany katalog
+            old_dir = None
+            if os.path.exists(final_dir):
+                old_dir = tmp_dir + '-old'
+                try:
+                    os.rename(final_dir, old_dir)
+                except OSError:
+                    old_dir = None
+            try:
+                os.rename(tmp_dir, final_dir)
+            except OSError:
+                # Ten sam fingerprint opublikował równolegle inny proces - zostaje jego
+                # wersja; jeśli nikt go nie opublikował, przywracamy poprzednią
+                if old_dir is not None and not os.path.exists(final_dir):
+                    os.rename(old_dir, final_dir)
+                    old_dir = None
+            if old_dir is not None:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.gc(spec)
+        return self._read_entry(final_dir)
+
+    def gc(self, spec):
+        """Usuwa najstarsze wersje z linii, zostawiając keep_versions najnowszych."""
+        for entry in self.versions(spec)[self.keep_versions:]:
+            shutil.rmtree(entry['path'], ignore_errors=True)
+
+    def artifact_path(self, entry):
+        return os.path.join(entry['path'], entry['artifact'])
+
+    def load(self, entry):
+        """Wczytuje model z artefaktu (Keras albo ridge)."""
+        return load_model(self.artifact_path(entry))
@@ -0,0 +1,65 @@
+from .imports import *
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def _init_worker(threads):
+    """
+    Ogranicza liczbę wątków TensorFlow/BLAS w procesie roboczym, żeby
+    równoległe treningi nie walczyły o te same rdzenie.
+    """
+    for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                     'TF_NUM_INTRAOP_THREADS'):
+        os.environ[variable] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _train_sector(job):
+    """
+    Trenuje model jednego sektora w procesie roboczym i zapisuje go w rejestrze.
+    Zwraca wpis rejestru (sam model wczytuje proces główny).
+    """
+    from .stock_prediction import StockPrediction
+
+    sector = job['sector']
+    predictor = StockPrediction({sector: job['ticker']}, **job['config'])
+    predictor.feature_arrays[sector] = job['features']
+    predictor.feature_dates[sector] = job['dates']
+    predictor.create_lstm_data()
+    predictor.create_or_load_model(sector, force_update=True)
+    return predictor.model_versions[sector]
+
+
+def train_sectors_in_parallel(jobs, max_workers=None, threads_per_worker=None, progress=None):
+    """
+    Trenuje sektory w osobnych procesach (kontekst 'spawn' - TensorFlow nie
+    jest bezpieczny przy fork). Błąd jednego sektora nie przerywa pozostałych.
+
+    :param jobs: lista słowników z kluczami sector, ticker, config, features, dates
+    :param progress: opcjonalne progress(sector, done, total, error)
+    :return: (entries, errors) - słowniki sektor -> wpis rejestru / wyjątek
+    """
+    entries, errors = {}, {}
+    if not jobs:
+        return entries, errors
+
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(max_workers or cpus, len(jobs)))
+    threads = threads_per_worker or max(1, cpus // workers)
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(threads,)) as executor:
+        futures = {executor.submit(_train_sector, job): job['sector'] for job in jobs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            sector = futures[future]
+            error = None
+            try:
+                entries[sector] = future.result()
+            except Exception as e:
+                errors[sector] = error = e
+            if progress is not None:
+                progress(sector, done, len(jobs), error)
+    return entries, errors
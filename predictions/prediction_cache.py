@@ -0,0 +1,118 @@
+from .imports import *
+import json
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+DEFAULT_PREDICTION_CACHE_DIR = os.environ.get('PREDICTION_CACHE_DIR', os.path.join('.cache', 'predictions'))
+
+
+def cache_key(ticker, fingerprint, last_bar_date, kind, horizon=None):
+    """
+    Klucz wyniku predykcji: ticker, fingerprint modelu, data ostatniego słupka,
+    rodzaj wyniku (np. 'forecast_20_days') i horyzont.
+    """
+    return json.dumps([ticker, fingerprint, str(last_bar_date), kind, horizon])
+
+
+class PredictionCache:
+    """
+    Dwupoziomowa pamięć wyników predykcji: w pamięci (LRU, memory_items wpisów)
+    i na dysku (pickle, LRU wg czasu ostatniego użycia, limit disk_bytes).
+    Wynik zmienia się tylko z nowym modelem albo nowym słupkiem - oba są w kluczu,
+    więc wpisów nie trzeba unieważniać, same wypadają z LRU.
+    """
+    def __init__(self, root=DEFAULT_PREDICTION_CACHE_DIR, memory_items=256, disk_bytes=256 * 1024 * 1024):
+        self.root = root
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {'memory': 0, 'disk': 0}
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.root, hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '.pkl')
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits['memory'] += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            # Czas modyfikacji = czas ostatniego użycia (kolejność usuwania z dysku)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            self.misses += 1
+            return default
+
+        self.hits['disk'] += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        self._remember(key, value)
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, pickle.PicklingError) as e:
+            print(f"[WARN] Unable to store prediction in cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict()
+
+    def get_or_compute(self, key, compute):
+        """Wynik z pamięci podręcznej albo compute() (zapisany w obu poziomach)."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _evict(self):
+        """Usuwa z dysku najdawniej używane wpisy ponad limit disk_bytes."""
+        stats = []
+        try:
+            for entry in os.scandir(self.root):
+                if entry.name.endswith('.pkl'):
+                    stat = entry.stat()
+                    stats.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            # Katalog albo plik usunięty równolegle przez inny proces
+            return
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in sorted(stats):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if os.path.isdir(self.root):
+            for entry in os.scandir(self.root):
+                if entry.name.endswith('.pkl'):
+                    os.remove(entry.path)
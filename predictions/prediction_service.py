@@ -0,0 +1,236 @@
+from .imports import *
+from .stock_prediction import StockPrediction
+from .backends import LSTM
+from .retraining import RetrainQueue, UPDATE
+from .feature_store import FeatureStore
+from .model_registry import ModelRegistry
+from .hyperparameter_search import HYPERPARAMETERS, load_best_configs
+from .prediction_cache import PredictionCache, cache_key
+from .parallel_training import train_sectors_in_parallel
+import threading
+from datetime import date
+import streamlit as st
+
+# Example tickers for different sectors
+DEFAULT_SECTORS = {
+    'Technology': 'AAPL',
+    'Healthcare': 'JNJ',
+    'Finance': 'JPM',
+    'Energy': 'XOM',
+    'Consumer Goods': 'PG'
+}
+
+# Liczba dni prognozowanych bezpośrednio przez modele stron Risky i Roulette
+DEFAULT_HORIZON = 20
+
+
+class PredictionService:
+    """
+    Długo żyjąca usługa predykcji, wspólna dla stron Risky i Roulette oraz
+    wszystkich sesji użytkowników. Dane przygotowuje raz dziennie, a model
+    sektora ładuje (lub trenuje) dopiero przy pierwszym wyborze tego sektora.
+
+    tuned - konfiguracje sektorów z przeszukiwania hiperparametrów
+    ({sektor: {window_size, epochs, batch_size, test_split, ticker, horizon, backend}});
+    używane tylko, gdy szukano ich dla tego samego tickera, horyzontu i backendu.
+    Sektory o tej samej konfiguracji obsługuje jeden predyktor.
+    """
+    def __init__(self, sectors, window_size=50, test_split=0.95, epochs=5, batch_size=32, backend=LSTM,
+                 horizon=1, shared=False, embedding_dim=0, tuned=None, max_cutoff_age=0):
+        self.sectors = dict(sectors)
+        defaults = {'window_size': window_size, 'epochs': epochs, 'batch_size': batch_size, 'test_split': test_split}
+
+        groups = {}
+        for sector, ticker in self.sectors.items():
+            config = dict(defaults)
+            tuned_config = (tuned or {}).get(sector)
+            # Model wspólny ma jedną konfigurację; wynik przeszukiwania dotyczy konkretnego
+            # tickera i modelu (horyzont, backend) - innemu modelowi nie musi pasować
+            sector_backend = backend.get(sector, LSTM) if isinstance(backend, dict) else backend
+            if not shared and tuned_config and tuned_config.get('ticker') == ticker \
+                    and tuned_config.get('horizon', 1) == horizon and tuned_config.get('backend', LSTM) == sector_backend:
+                config.update({name: tuned_config[name] for name in HYPERPARAMETERS if name in tuned_config})
+            groups.setdefault(tuple(config[name] for name in HYPERPARAMETERS), []).append(sector)
+
+        feature_store, model_registry = FeatureStore(), ModelRegistry()
+        self._predictors = {}
+        for key, group in groups.items():
+            predictor = StockPrediction({sector: self.sectors[sector] for sector in group},
+                                        **dict(zip(HYPERPARAMETERS, key)), backend=backend, horizon=horizon,
+                                        shared=shared, embedding_dim=embedding_dim, max_cutoff_age=max_cutoff_age,
+                                        feature_store=feature_store, model_registry=model_registry)
+            for sector in group:
+                self._predictors[sector] = predictor
+        self._data_lock = threading.Lock()
+        self._model_locks = {sector: threading.Lock() for sector in self.sectors}
+        self._prepared_on = None
+        # Retreningi wykonywane w tle (jeden naraz)
+        self.retrain_queue = RetrainQueue(self)
+        # Wyniki predykcji wg (ticker, wersja modelu, ostatni słupek, rodzaj, horyzont)
+        self.prediction_cache = PredictionCache()
+
+    def predictor_for(self, sector):
+        """Predyktor (StockPrediction) obsługujący sektor - z jego konfiguracją."""
+        return self._predictors[sector]
+
+    @property
+    def predictors(self):
+        """Różne predyktory usługi (po jednym na konfigurację)."""
+        return list({id(predictor): predictor for predictor in self._predictors.values()}.values())
+
+    def ensure_data(self):
+        """Pobiera i przetwarza dane, jeśli nie zrobiono tego jeszcze dzisiaj."""
+        if self._prepared_on == date.today():
+            return
+        with self._data_lock:
+            if self._prepared_on == date.today():
+                return
+            for predictor in self.predictors:
+                predictor.download_data()
+                predictor.preprocess_features()
+                predictor.create_lstm_data()
+            self._prepared_on = date.today()
+
+    def sector_data(self, sector):
+        """Surowe notowania i cechy względne sektora (df_raw, data_rel)."""
+        self.ensure_data()
+        predictor = self.predictor_for(sector)
+        return predictor.dataframes[sector], predictor.relative_data[sector]
+
+    def get_model(self, sector):
+        """
+        Zwraca model sektora, ładując go z rejestru (albo trenując) przy pierwszym
+        użyciu. None, jeśli dla sektora brak danych lub trening się nie powiódł.
+        """
+        return self.get_model_version(sector)[0]
+
+    def get_model_version(self, sector):
+        """
+        Model sektora razem z jego wpisem rejestru, odczytane razem pod blokadą
+        sektora - retrening w tle (swap_model) nie rozdzieli modelu i wersji.
+        Zwraca (model, wpis) albo (None, None) jak get_model.
+        """
+        predictor = self.predictor_for(sector)
+        with self._model_locks[sector]:
+            model = predictor.models.get(sector)
+            if model is not None:
+                return model, predictor.model_versions.get(sector)
+
+        self.ensure_data()
+        if sector not in predictor.lstm_train_data:
+            return None, None
+
+        with self._model_locks[sector]:
+            model = predictor.models.get(sector)
+            if model is None:
+                try:
+                    model = predictor.create_or_load_model(sector)
+                except Exception as e:
+                    print(f"[ERROR] Unable to train or load the model for {sector}: {e}")
+                    return None, None
+                predictor.models[sector] = model
+            return model, predictor.model_versions.get(sector)
+
+    def cached(self, sector, entry, kind, compute, horizon=None):
+        """
+        Wynik compute() dla modelu o wpisie rejestru 'entry' (z get_model_version -
+        tego samego, którego używa compute) i danych sektora - z pamięci podręcznej,
+        jeśli ten model liczył go już dla tego samego ostatniego słupka.
+        """
+        predictor = self.predictor_for(sector)
+        df = predictor.dataframes.get(sector)
+        if entry is None or df is None or df.empty:
+            return compute()
+        # trained_at odróżnia wymuszony retrening o tym samym fingerprincie
+        version = f"{entry['fingerprint']}@{entry.get('trained_at')}"
+        key = cache_key(predictor.sectors[sector], version, df['Date'].iloc[-1], kind, horizon)
+        return self.prediction_cache.get_or_compute(key, compute)
+
+    def cutoff_note(self, sector, entry):
+        """
+        Opis danych serwowanego modelu: (tekst, czy model jest starszy niż bieżące
+        dane) albo None, gdy nie ma wpisu rejestru.
+        """
+        if entry is None:
+            return None
+        served = entry['spec']['data_cutoff']
+        predictor = self.predictor_for(sector)
+        current = (predictor.shared_model_spec() if predictor.shared else predictor.model_spec(sector))['data_cutoff']
+        if served == current:
+            return f"Model trained on data up to {served}.", False
+        return (f"Model trained on data up to {served}; the current data would train up to {current}. "
+                "Use a quick update or a retrain to include the newer days."), True
+
+    def warm_up(self, parallel=True, progress=None, max_workers=None, threads_per_worker=None):
+        """
+        Przygotowuje od razu modele wszystkich sektorów - akcja w panelu bocznym
+        stron (warm_up_panel), zamiast leniwie przy wyborze. Sektory z załadowanym
+        modelem są pomijane; modele z rejestru są wczytywane, a brakujące trenowane
+        w jednej wspólnej puli procesów (niezależnie od konfiguracji predyktorów)
+        i publikowane przez swap_model.
+        progress(sector, done, total, error) raportuje postęp wszystkich sektorów łącznie.
+        """
+        self.ensure_data()
+        sectors = [sector for sector in self.sectors
+                   if sector in self.predictor_for(sector).lstm_train_data
+                   and sector not in self.predictor_for(sector).models]
+        done = 0
+
+        def report(sector, error):
+            nonlocal done
+            done += 1
+            if progress is not None:
+                progress(sector, done, len(sectors), error)
+
+        jobs = []
+        for sector in sectors:
+            predictor = self.predictor_for(sector)
+            # Model wspólny trenuje się raz dla wszystkich sektorów - bez puli procesów
+            if parallel and not predictor.shared:
+                spec = predictor.model_spec(sector)
+                if not predictor.model_registry.lookup(spec, predictor.max_cutoff_age):
+                    jobs.append(predictor.training_job(sector))
+                    continue
+            model, _ = self.get_model_version(sector)
+            report(sector, None if model is not None else RuntimeError(f"No model for {sector}"))
+
+        entries, errors = train_sectors_in_parallel(jobs, max_workers, threads_per_worker,
+                                                    lambda sector, _, __, error: report(sector, error))
+        for sector, error in errors.items():
+            print(f"[ERROR] Training failed for {sector}: {error}")
+        for sector, entry in entries.items():
+            self.swap_model(sector, self.predictor_for(sector).model_registry.load(entry), entry)
+
+    def swap_model(self, sector, model, entry):
+        """Atomowo podmienia model sektora (i jego wpis rejestru) dla wszystkich sesji."""
+        predictor = self.predictor_for(sector)
+        with self._model_locks[sector]:
+            predictor.model_versions[sector] = entry
+            predictor.models[sector] = model
+
+    def retrain(self, sector):
+        """Zleca retrening sektora w tle i zwraca zadanie (RetrainJob)."""
+        return self.retrain_queue.submit(sector)
+
+    def update(self, sector, epochs=2):
+        """Zleca w tle szybkie dotrenowanie modelu sektora na nowych słupkach."""
+        return self.retrain_queue.submit(sector, mode=UPDATE, update_epochs=epochs)
+
+
+@st.cache_resource
+def get_prediction_service(window_size=50, test_split=0.95, epochs=5, batch_size=32, backend=LSTM, horizon=1,
+                           shared=False, embedding_dim=0, use_tuned=True, max_cutoff_age=0):
+    """
+    Jedna instancja usługi na proces serwera Streamlit (wspólna dla sesji i stron).
+    backend: LSTM / RIDGE albo słownik sektor -> backend; horizon: liczba dni
+    prognozowanych bezpośrednio jednym wywołaniem modelu; shared: jeden model
+    dla wszystkich tickerów (opcjonalnie z zanurzeniem tickera o wymiarze embedding_dim).
+    Przy use_tuned sektory z zapisaną zwycięską konfiguracją (hyperparameter_search)
+    używają jej zamiast podanych wartości domyślnych. max_cutoff_age: ile dni
+    starsze dane treningowe może mieć model z rejestru serwowany zamiast
+    nowego treningu (0 - tylko model wytrenowany na bieżących danych).
+    """
+    return PredictionService(DEFAULT_SECTORS, window_size=window_size, test_split=test_split,
+                             epochs=epochs, batch_size=batch_size, backend=backend, horizon=horizon,
+                             shared=shared, embedding_dim=embedding_dim,
+                             tuned=load_best_configs() if use_tuned else None, max_cutoff_age=max_cutoff_age)
@@ -1,5 +1,20 @@
 import numpy as np
 import pandas as pd
+from .inference import get_predictor, output_width
+
+HORIZON = 20
+
+
+def direct_paths(model, windows):
+    """
+    Direct multi-horizon forecast: one forward pass for a stack of windows
+    (n, window_size, features) -> (n, 20) relative changes.
+    Returns None when the model predicts only the next day.
+    """
+    if output_width(model) < HORIZON:
+        return None
+    windows = np.asarray(windows)
+    return np.asarray(get_predictor(model).predict(windows)).reshape(len(windows), -1)[:, :HORIZON]
 
 
 def predict_20_days(model, data, window_size, df):
@@ -11,16 +26,21 @@ def predict_20_days(model, data, window_size, df):
     predicted_prices = []
     dates = []
     original_prices = []
+    predictor = get_predictor(model)
 
     last_window = data.iloc[-(window_size + 20):-20].values
     last_close_price = df['Close'].iloc[-20]
 
+    direct = direct_paths(model, last_window[None])
+    if direct is not None:
+        return _history_frame(direct[0], df)
+
     for i in range(20):
         # Prepare data for the model
         input_data = np.reshape(last_window, (1, window_size, last_window.shape[1]))
 
         # Predict relative price change
-        next_price_change = model.predict(input_data)[0][0]
+        next_price_change = predictor.predict(input_data)[0][0]
         predictions.append(next_price_change)
 
         # Calculate the next actual price
@@ -72,6 +92,7 @@ def predict_20_days_future_only(model, data, window_size, df):
     """
     predictions = []
     predicted_prices = []
+    predictor = get_predictor(model)
 
     # Last known price in df
     last_close_price = df["Close"].iloc[-1]
@@ -80,11 +101,15 @@ def predict_20_days_future_only(model, data, window_size, df):
     # Input window for prediction
     last_window = data.iloc[-window_size:].values
 
+    direct = direct_paths(model, last_window[None])
+    if direct is not None:
+        return _future_frame(direct[0], df)
+
     for _ in range(20):
         # Prepare data for the model
         input_data = np.reshape(last_window, (1, window_size, last_window.shape[1]))
 
-        next_price_change = model.predict(input_data)[0][0]
+        next_price_change = predictor.predict(input_data)[0][0]
         predictions.append(next_price_change)
 
         current_price *= (1 + next_price_change)
@@ -107,3 +132,37 @@ def predict_20_days_future_only(model, data, window_size, df):
     })
 
     return result_df, text
+
+
+def _history_frame(changes, df):
+    """predict_20_days result for a path of 20 predicted relative changes."""
+    return pd.DataFrame({
+        'Date': df['Date'].iloc[-20:].values,
+        'Predicted_Price': df['Close'].iloc[-20] * np.cumprod(1 + changes),
+        'Original_Price': df['Close'].iloc[-20:].values,
+        'Predictions': changes
+    })
+
+
+def _future_frame(changes, df):
+    """predict_20_days_future_only result for a path of 20 predicted relative changes."""
+    last_close_price = df["Close"].iloc[-1]
+    predicted_prices = last_close_price * np.cumprod(1 + changes)
+    text = "Stock prices will rise" if predicted_prices[-1] > last_close_price else "Stock prices will fall"
+    return pd.DataFrame({'Predicted_Price': predicted_prices}), text
+
+
+def forecast_20_days(model, data, window_size, df):
+    """
+    Historical and future 20-day forecasts together.
+    With a direct multi-horizon model both windows go through a single model call;
+    otherwise falls back to the autoregressive predict_20_days / predict_20_days_future_only.
+
+    Returns: (result_history, result_future, text) as the two functions above.
+    """
+    windows = np.stack([data.iloc[-(window_size + 20):-20].values, data.iloc[-window_size:].values])
+    direct = direct_paths(model, windows)
+    if direct is None:
+        return (predict_20_days(model, data, window_size, df),
+                *predict_20_days_future_only(model, data, window_size, df))
+    return (_history_frame(direct[0], df), *_future_frame(direct[1], df))
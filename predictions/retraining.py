@@ -0,0 +1,197 @@
+from .imports import *
+from .backends import artifact_name
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Stany zadania retreningu
+QUEUED, RUNNING, FINISHED, FAILED, CANCELLED = 'queued', 'running', 'finished', 'failed', 'cancelled'
+# Tryby: pełny trening od zera albo dotrenowanie na nowych słupkach
+FULL, UPDATE = 'full', 'update'
+
+
+class RetrainJob:
+    """Stan jednego zadania retreningu (czytany przez strony podczas treningu)."""
+    def __init__(self, sector, epochs, mode=FULL):
+        self.id = uuid.uuid4().hex[:8]
+        self.sector = sector
+        self.mode = mode
+        self.status = QUEUED
+        self.epoch = 0
+        self.epochs = epochs
+        self.batch = 0
+        self.batches = None
+        self.loss = None
+        self.val_loss = None
+        self.error = None
+        # Krótka informacja o wyniku (np. tryb treningu albo brak nowych danych)
+        self.message = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def progress(self):
+        """Postęp 0-1 (epoki + ułamek bieżącej epoki)."""
+        if not self.epochs:
+            return 0.0
+        fraction = self.batch / self.batches if self.batches else 0.0
+        return min(1.0, (self.epoch + fraction) / self.epochs)
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+
+class _JobProgress(tf.keras.callbacks.Callback):
+    """Przekazuje postęp treningu do zadania i przerywa trening po anulowaniu."""
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+
+    def on_train_begin(self, logs=None):
+        # Fine-tuning może przejść w pełny trening z inną liczbą epok
+        self.job.epoch = 0
+        self.job.epochs = self.params.get('epochs') or self.job.epochs
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.job.batch = 0
+        self.job.batches = self.params.get('steps')
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.job.batch = batch + 1
+        if logs and 'loss' in logs:
+            self.job.loss = float(logs['loss'])
+        if self.job.cancel_requested:
+            self.model.stop_training = True
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        self.job.epoch = epoch + 1
+        self.job.loss = float(logs['loss']) if 'loss' in logs else self.job.loss
+        self.job.val_loss = float(logs['val_loss']) if 'val_loss' in logs else self.job.val_loss
+        if self.job.cancel_requested:
+            self.model.stop_training = True
+
+
+class RetrainQueue:
+    """
+    Kolejka retreningów w tle. Zadanie trenuje nowy model, a po sukcesie
+    usługa atomowo podmienia model sektora - do tego czasu predykcje
+    serwuje dotychczasowy model. Historia przechowuje keep_finished ostatnich
+    zakończonych zadań każdego sektora.
+    """
+    def __init__(self, service, max_workers=1, keep_finished=5):
+        self.service = service
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='retrain')
+        self._lock = threading.RLock()
+        self._jobs = {}
+
+    def submit(self, sector, mode=FULL, update_epochs=2):
+        """
+        Dodaje zadanie dla sektora (albo zwraca już trwające). mode=UPDATE
+        dotrenowuje najnowszy model przez update_epochs epok na nowych słupkach;
+        model wspólny (shared) można tylko wytrenować od nowa.
+        """
+        if mode == UPDATE and self.service.predictor_for(sector).shared:
+            raise ValueError("Quick updates are not supported for the shared model, submit a full retrain")
+        with self._lock:
+            active = self.active_job(sector)
+            if active is not None:
+                return active
+            epochs = update_epochs if mode == UPDATE else self.service.predictor_for(sector).epochs
+            job = RetrainJob(sector, epochs, mode)
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def _prune(self, sector):
+        """Usuwa zakończone zadania sektora ponad keep_finished najnowszych."""
+        with self._lock:
+            finished = [job for job in self.jobs(sector) if not job.active]
+            for job in finished[self.keep_finished:]:
+                del self._jobs[job.id]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None and job.active:
+            job.cancel()
+        return job
+
+    def jobs(self, sector=None):
+        """Zadania (najnowsze pierwsze), opcjonalnie tylko dla sektora."""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if sector is None or job.sector == sector]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def active_job(self, sector):
+        return next((job for job in self.jobs(sector) if job.active), None)
+
+    def latest_job(self, sector):
+        jobs = self.jobs(sector)
+        return jobs[0] if jobs else None
+
+    def _run(self, job):
+        if job.cancel_requested:
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            self._prune(job.sector)
+            return
+        job.status = RUNNING
+        try:
+            self.service.ensure_data()
+            predictor = self.service.predictor_for(job.sector)
+            callbacks = [_JobProgress(job)]
+            if predictor.shared:
+                self._run_shared(job, predictor, callbacks)
+                return
+            if job.mode == UPDATE:
+                result = predictor.update_model(job.sector, epochs=job.epochs, callbacks=callbacks)
+            else:
+                result = predictor.fit_model(job.sector, callbacks=callbacks)
+
+            if result is None:
+                job.message = 'The model is already up to date with the latest data.'
+                job.status = FINISHED
+                return
+            model, spec, metrics = result
+            job.message = f"Training mode: {metrics.get('mode', job.mode)}, {metrics['train_seconds']:.1f} s."
+            if job.cancel_requested:
+                job.status = CANCELLED
+            else:
+                job.val_loss = metrics.get('val_loss', job.val_loss)
+                entry = predictor.model_registry.register(spec, model.save, metrics, artifact=artifact_name(model))
+                self.service.swap_model(job.sector, model, entry)
+                job.status = FINISHED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            self._prune(job.sector)
+
+    def _run_shared(self, job, predictor, callbacks):
+        """Retrening modelu wspólnego - po sukcesie podmieniany jest model wszystkich sektorów."""
+        model, spec, metrics = predictor.fit_shared_model(callbacks=callbacks)
+        job.message = f"Shared model for {metrics['tickers']} tickers, {metrics['train_seconds']:.1f} s."
+        if job.cancel_requested:
+            job.status = CANCELLED
+            return
+        job.val_loss = metrics.get('val_loss', job.val_loss)
+        entry = predictor.model_registry.register(spec, model.save, metrics, artifact=artifact_name(model))
+        predictor.shared_model, predictor.shared_entry = model, entry
+        for sector in predictor.lstm_train_data:
+            self.service.swap_model(sector, predictor.bind_shared_model(sector, model, entry), entry)
+        job.status = FINISHED
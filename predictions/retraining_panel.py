@@ -0,0 +1,77 @@
+import streamlit as st
+from .retraining import FINISHED, FAILED, CANCELLED, UPDATE
+
+
+def retraining_panel(service, sector):
+    """Retrain button with the status of the background retraining job (progress, loss, cancel)."""
+    queue = service.retrain_queue
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button(f"Retrain the model for sector: {sector}"):
+            queue.submit(sector)
+    with col2:
+        # The shared model covers all tickers and can only be retrained as a whole
+        shared = service.predictor_for(sector).shared
+        if st.button("Quick update on new data", key=f"update_{sector}", disabled=shared,
+                     help="Not available for the shared model: retraining refits it on all tickers." if shared else
+                          "Fine-tunes the latest model only on days added since it was trained; "
+                          "falls back to a full retrain if validation loss gets worse."):
+            queue.submit(sector, mode=UPDATE)
+
+    job = queue.latest_job(sector)
+    if job is None:
+        return
+
+    if job.active:
+        kind = "Update" if job.mode == UPDATE else "Retraining"
+        text = f"{kind} job {job.id} ({job.status}): epoch {min(job.epoch + 1, job.epochs)}/{job.epochs}"
+        if job.loss is not None:
+            text += f", loss {job.loss:.5f}"
+        st.progress(job.progress, text=text)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button("Refresh status", key=f"refresh_{job.id}")
+        with col2:
+            if st.button("Cancel retraining", key=f"cancel_{job.id}"):
+                queue.cancel(job.id)
+                st.info(f"Cancelling retraining job {job.id}...")
+        st.caption("Predictions keep using the current model until the new one is ready.")
+
+    elif job.status == FINISHED:
+        val_loss = f", validation loss {job.val_loss:.5f}" if job.val_loss is not None else ""
+        if job.val_loss is None and job.message:
+            st.info(f"Job {job.id}: {job.message}")
+        else:
+            st.success(f"The model for sector {sector} has been retrained (job {job.id}{val_loss}). "
+                       "The new model is now serving predictions.")
+            if job.message:
+                st.caption(job.message)
+    elif job.status == FAILED:
+        st.error(f"Retraining job {job.id} for sector {sector} failed: {job.error}")
+    elif job.status == CANCELLED:
+        st.warning(f"Retraining job {job.id} for sector {sector} was cancelled. The previous model is still in use.")
+
+
+def warm_up_panel(service):
+    """Sidebar action that trains or loads the models of all sectors at once, missing ones in parallel processes."""
+    if not st.sidebar.button("Prepare models for all sectors",
+                             help="Loads stored models and trains the missing ones in parallel, "
+                                  "so later sector changes do not wait for training."):
+        return
+
+    bar = st.sidebar.progress(0.0, text="Preparing models...")
+    failed = []
+
+    def progress(sector, done, total, error):
+        if error is not None:
+            failed.append(sector)
+        bar.progress(done / total, text=f"Prepared {done}/{total} models ({sector})")
+
+    with st.spinner("Preparing models for all sectors..."):
+        service.warm_up(parallel=True, progress=progress)
+    if failed:
+        st.sidebar.error(f"Unable to prepare models for: {', '.join(failed)}")
+    else:
+        st.sidebar.success("Models for all sectors are ready.")
@@ -3,43 +3,44 @@ import pandas as pd
 import plotly.express as px
 from .predictions_utils import *
 from .stock_prediction import *
+from .prediction_service import get_prediction_service, DEFAULT_HORIZON
+from .retraining_panel import retraining_panel, warm_up_panel
+from .inference import format_latency
 
 def run_risky():
     st.title("Risky – Stock Price Prediction for 20 Days with Rise or Fall Recommendation")
 
-    # Example tickers for different sectors
-    sectors = {
-        'Technology': 'AAPL',
-        'Healthcare': 'JNJ',
-        'Finance': 'JPM',
-        'Energy': 'XOM',
-        'Consumer Goods': 'PG'
-    }
-
-    # Initialize the StockPrediction object
-    predictor = StockPrediction(sectors, window_size=50, test_split=0.95, epochs=5, batch_size=32)
-    predictor.download_data()
-    predictor.preprocess_features()
-    predictor.create_lstm_data()
-    predictor.train_models(force_update=False)
+    # Process-wide service: data is prepared once and models are loaded lazily.
+    # Models forecast 20 days directly; the first output is the next-day change.
+    # Sectors with a saved hyperparameter search result use it instead of these defaults.
+    # A stored model trained on data up to 30 days older than the current data is served
+    # instead of retraining; the page shows its cutoff and the retraining panel can refresh it.
+    service = get_prediction_service(window_size=50, test_split=0.95, epochs=5, batch_size=32, horizon=DEFAULT_HORIZON,
+                                     max_cutoff_age=30)
+    sectors = service.sectors
+    warm_up_panel(service)
 
     # Select sector for prediction
     chosen_sector = st.selectbox("Select a sector:", list(sectors.keys()))
     ticker = sectors[chosen_sector]  # Stock code
 
+    with st.spinner(f"Loading the model for sector {chosen_sector}..."):
+        model, entry = service.get_model_version(chosen_sector)
+
     # Prediction section – if a model exists for the chosen sector
-    if chosen_sector in predictor.models:
-        model = predictor.models[chosen_sector]
-        df_raw = predictor.dataframes[chosen_sector]  # Original DataFrame
-        data_rel = predictor.relative_data[chosen_sector]  # Data with relative features
+    if model is not None:
+        df_raw, data_rel = service.sector_data(chosen_sector)  # Original DataFrame, data with relative features
+        predictor = service.predictor_for(chosen_sector)  # Tuned configuration of the sector, if any
         window_size = predictor.window_size
 
-        # Historical prediction
-        result_history = predict_20_days(model, data_rel, window_size, df_raw)
-
-        # Future prediction
-        result_future, future_text = predict_20_days_future_only(model, data_rel, window_size, df_raw)
+        # Historical and future prediction (one model call with a direct 20-day model)
+        # Cached per model version and last bar: repeat views make no model calls
+        result_history, result_future, future_text = service.cached(
+            chosen_sector, entry, 'forecast_20_days', lambda: forecast_20_days(model, data_rel, window_size, df_raw),
+            horizon=20)
         future_dates = pd.date_range(start=df_raw['Date'].iloc[-1] + pd.Timedelta(days=1), periods=20, freq='B')
+        # The cached result is shared by all sessions - work on a copy
+        result_future = result_future.copy()
         result_future['Date'] = future_dates
 
         # Top section with charts
@@ -73,47 +74,20 @@ def run_risky():
         st.markdown(f"<h1 style='text-align: center; color: green;'>{future_text}</h1>", unsafe_allow_html=True)
         st.markdown(f"<h2 style='text-align: center;'>Stock Code: {ticker}</h2>", unsafe_allow_html=True)
 
-        # Button to retrain the model
-        if st.button(f"Retrain the model for sector: {chosen_sector}"):
-            predictor.models[chosen_sector] = predictor.create_or_load_model(chosen_sector, force_update=True)
-            st.success(f"The model for sector {chosen_sector} has been retrained!")
-
-            # Refresh results after retraining
-            result_history = predict_20_days(model, data_rel, window_size, df_raw)
-            result_future, future_text = predict_20_days_future_only(model, data_rel, window_size, df_raw)
-
-            # Refresh charts after retraining
-            st.write("Updated Results")
-
-            with col1:
-                fig_history = px.line(
-                    result_history,
-                    x='Date',
-                    y=['Original_Price', 'Predicted_Price'],
-                    title="Historical Data (Updated)",
-                    labels={
-                        'Date': 'Date',
-                        'Original_Price': 'Original Price',
-                        'Predicted_Price': 'Predicted Price'
-                    }
-                )
-                st.plotly_chart(fig_history, use_container_width=True)
-
-            with col2:
-                fig_future = px.line(
-                    result_future,
-                    x='Date',
-                    y='Predicted_Price',
-                    title="Future Price Forecast (Updated)",
-                    labels={
-                        'Date': 'Date',
-                        'Predicted_Price': 'Predicted Price'
-                    }
-                )
-                st.plotly_chart(fig_future, use_container_width=True)
-
-            # Updated prediction text
-            st.markdown(f"<h1 style='text-align: center; color: green;'>{future_text}</h1>", unsafe_allow_html=True)
+        latency = format_latency(model)
+        if latency:
+            st.caption(latency)
+
+        cutoff = service.cutoff_note(chosen_sector, entry)
+        if cutoff:
+            text, stale = cutoff
+            if stale:
+                st.warning(text)
+            else:
+                st.caption(text)
+
+        # Retraining runs in the background; the current model keeps serving predictions
+        retraining_panel(service, chosen_sector)
 
     else:
         st.warning(f"The model for sector {chosen_sector} has not been loaded yet.")
@@ -4,42 +4,50 @@ import numpy as np
 import plotly.express as px
 from .predictions_utils import *
 from .stock_prediction import *
+from .prediction_service import get_prediction_service, DEFAULT_HORIZON
+from .retraining_panel import retraining_panel, warm_up_panel
 from .day2day_trading import *
+from .inference import format_latency
+from .evaluation import evaluate_model, evaluate_registry_versions
 
 
 def run_roulette():
     st.title("Roulette – Predicting Stock Increases or Decreases for the Next Day")
 
-    # Example tickers for different sectors
-    sectors = {
-        'Technology': 'AAPL',
-        'Healthcare': 'JNJ',
-        'Finance': 'JPM',
-        'Energy': 'XOM',
-        'Consumer Goods': 'PG'
-    }
-
-    # Initialize the StockPrediction object
-    predictor = StockPrediction(sectors, window_size=50, test_split=0.95, epochs=5, batch_size=32)
-    predictor.download_data()
-    predictor.preprocess_features()
-    predictor.create_lstm_data()
-    predictor.train_models(force_update=False)
+    # Process-wide service: data is prepared once and models are loaded lazily.
+    # Models forecast 20 days directly; the first output is the next-day change.
+    # Sectors with a saved hyperparameter search result use it instead of these defaults.
+    # A stored model trained on data up to 30 days older than the current data is served
+    # instead of retraining; the page shows its cutoff and the retraining panel can refresh it.
+    service = get_prediction_service(window_size=50, test_split=0.95, epochs=5, batch_size=32, horizon=DEFAULT_HORIZON,
+                                     max_cutoff_age=30)
+    sectors = service.sectors
+    warm_up_panel(service)
 
     # Select sector for prediction
     chosen_sector = st.selectbox("Select a sector:", list(sectors.keys()))
     ticker = sectors[chosen_sector]  # Stock code
 
+    with st.spinner(f"Loading the model for sector {chosen_sector}..."):
+        model, entry = service.get_model_version(chosen_sector)
+
     # Prediction section – if a model exists for the chosen sector
-    if chosen_sector in predictor.models:
-        model = predictor.models[chosen_sector]
-        df_raw = predictor.dataframes[chosen_sector]  # Original DataFrame
-        data_rel = predictor.relative_data[chosen_sector]  # Data with relative features
+    if model is not None:
+        df_raw, data_rel = service.sector_data(chosen_sector)  # Original DataFrame, data with relative features
+        predictor = service.predictor_for(chosen_sector)  # Tuned configuration of the sector, if any
         window_size = predictor.window_size
 
+        # Simulation horizon: from 20 days up to the whole test period
+        test_days = len(data_rel) - int(len(data_rel) * predictor.test_split)
+        horizon_options = sorted({h for h in (20, 60, 120, 250) if h < test_days} | {max(test_days, 20)})
+        horizon = st.select_slider("Trading simulation horizon (days):", options=horizon_options, value=horizon_options[0])
+
         # Day-to-day trading simulation
-        st.subheader("20-Day Trading Simulation")
-        trading_results = day2day_trading(model, data_rel, window_size, df_raw)
+        st.subheader(f"{horizon}-Day Trading Simulation")
+        # Results are cached per model version and last bar: repeat views make no model calls
+        trading_results = service.cached(
+            chosen_sector, entry, 'day2day_trading', lambda: day2day_trading(model, data_rel, window_size, df_raw, horizon=horizon),
+            horizon=horizon)
 
         # Display portfolio value chart
         fig_trading = px.line(
@@ -62,36 +70,46 @@ def run_roulette():
 
         # Prediction for the next day
         st.subheader("Predicted Change for the Next Day")
-        predicted_change, prediction_text, prediction_color = predict_next_day(model, data_rel, window_size)
+        predicted_change, prediction_text, prediction_color = service.cached(
+            chosen_sector, entry, 'predict_next_day', lambda: predict_next_day(model, data_rel, window_size), horizon=1)
         st.markdown(
             f"<h2 style='text-align: center; color: {prediction_color};'>{prediction_text}</h2>",
             unsafe_allow_html=True
         )
 
-        # Button to retrain the model
-        if st.button(f"Retrain the model for sector: {chosen_sector}"):
-            predictor.models[chosen_sector] = predictor.create_or_load_model(chosen_sector, force_update=True)
-            st.success(f"The model for sector {chosen_sector} has been retrained!")
-
-            # Refresh results after retraining
-            trading_results = day2day_trading(model, data_rel, window_size, df_raw)
-            correct_predictions = (trading_results['Predicted_Action'] == trading_results['Actual_Action']).sum()
-            accuracy = (correct_predictions / len(trading_results)) * 100
-            predicted_change, prediction_text, prediction_color = predict_next_day(model, data_rel, window_size)
-
-            # Refresh chart and accuracy
-            fig_trading = px.line(
-                trading_results,
-                x='Date',
-                y='Balance',
-                title="Portfolio Value Over Time (Updated)"
-            )
-            st.plotly_chart(fig_trading, use_container_width=True)
-            st.markdown(f"**Accuracy Percentage:** {accuracy:.2f}%")
-            st.markdown(
-                f"<h2 style='text-align: center; color: {prediction_color};'>{prediction_text}</h2>",
-                unsafe_allow_html=True
-            )
+        latency = format_latency(model)
+        if latency:
+            st.caption(latency)
+
+        cutoff = service.cutoff_note(chosen_sector, entry)
+        if cutoff:
+            text, stale = cutoff
+            if stale:
+                st.warning(text)
+            else:
+                st.caption(text)
+
+        # Walk-forward evaluation over the whole held-out period
+        with st.expander("Walk-forward evaluation (whole test period)"):
+            scores = service.cached(
+                chosen_sector, entry, 'walk_forward',
+                lambda: evaluate_model(model, data_rel.to_numpy(), window_size, predictor.test_split))
+            if scores['days']:
+                col1, col2, col3, col4, col5 = st.columns(5)
+                col1.metric("Days evaluated", scores['days'])
+                col2.metric("Hit rate", f"{scores['hit_rate'] * 100:.2f}%")
+                col3.metric("MAE", f"{scores['mae'] * 100:.3f} pp")
+                col4.metric("Strategy return", f"{scores['strategy_return'] * 100:.2f}%",
+                            delta=f"{(scores['strategy_return'] - scores['buy_and_hold_return']) * 100:.2f} pp vs buy & hold")
+                col5.metric("Max drawdown", f"{scores['max_drawdown'] * 100:.2f}%")
+
+            if st.checkbox("Compare all stored versions of this model"):
+                with st.spinner("Evaluating stored model versions..."):
+                    versions = evaluate_registry_versions(predictor, chosen_sector)
+                st.dataframe(versions, use_container_width=True)
+
+        # Retraining runs in the background; the current model keeps serving predictions
+        retraining_panel(service, chosen_sector)
 
     else:
         st.warning(f"The model for sector {chosen_sector} has not been loaded yet.")
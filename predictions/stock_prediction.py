@@ -1,7 +1,21 @@
 from .imports import *
+from .windows import sliding_windows, WindowBatches
+from .data_pipeline import window_dataset
+from .feature_store import FeatureStore, FEATURE_COLUMNS, FEATURE_VERSION
+from .indicator_engine import IndicatorEngine
+from .model_registry import ModelRegistry
+from .backends import LSTM as LSTM_BACKEND, RIDGE, artifact_name
+from .linear_model import RidgeWindowModel
+from .universe_model import UNIVERSE, build_universe_model, TickerBoundModel
+from .parallel_training import train_sectors_in_parallel
+import time
+import threading
 
 class StockPrediction:
-    def __init__(self, sectors, window_size=50, test_split=0.95, epochs=10, batch_size=32):
+    def __init__(self, sectors, window_size=50, test_split=0.95, epochs=10, batch_size=32, bar_store=None,
+                 download_workers=8, feature_store=None, model_registry=None, streaming=False,
+                 backend=LSTM_BACKEND, ridge_alpha=1.0, horizon=1, shared=False, embedding_dim=0,
+                 rsi_method='simple', max_cutoff_age=0):
         self.sectors = sectors
         self.window_size = window_size
         self.test_split = test_split
@@ -9,19 +23,62 @@ class StockPrediction:
         self.batch_size = batch_size
         self.dataframes = {}
         self.relative_data = {}
+        # Macierze cech (float32, memmap) - z nich powstają okna treningowe
+        self.feature_arrays = {}
+        # Daty wierszy macierzy cech (do wyznaczania daty odcięcia danych treningowych)
+        self.feature_dates = {}
         self.lstm_train_data = {}
         self.lstm_test_data = {}
         self.models = {}
+        # Wpisy rejestru (fingerprint, metadane) dla załadowanych modeli
+        self.model_versions = {}
+        # Lokalny magazyn notowań - dociąga tylko nowe słupki
+        self.bar_store = bar_store if bar_store is not None else BarStore()
+        # Maksymalna liczba równoległych pobrań tickerów
+        self.download_workers = download_workers
+        # RSI ze średnich kroczących ('simple') albo wygładzany metodą Wildera ('wilder')
+        self.rsi_method = rsi_method
+        if feature_store is None:
+            feature_store = FeatureStore(version=FEATURE_VERSION if rsi_method == 'simple'
+                                         else f"{FEATURE_VERSION}-{rsi_method}")
+        self.feature_store = feature_store
+        self.model_registry = model_registry if model_registry is not None else ModelRegistry()
+        # Trening na strumieniu tf.data (okna generowane w locie z macierzy cech)
+        self.streaming = streaming
+        # Backend modelu: nazwa (LSTM / RIDGE) albo słownik sektor -> nazwa
+        self.backend = backend
+        self.ridge_alpha = ridge_alpha
+        # Liczba prognozowanych dni: >1 - model bezpośrednio zwraca zmiany na horizon dni naprzód
+        self.horizon = horizon
+        # Jeden wspólny model (LSTM) dla wszystkich tickerów zamiast modelu na sektor;
+        # embedding_dim > 0 dodaje wektor zanurzenia tickera
+        self.shared = shared
+        self.embedding_dim = embedding_dim
+        self.shared_model = None
+        self.shared_entry = None
+        # Ile dni starsze dane treningowe może mieć model z rejestru użyty zamiast
+        # nowego treningu (0 - tylko model dokładnie pasujący do bieżących danych)
+        self.max_cutoff_age = max_cutoff_age
+        self._shared_lock = threading.Lock()
 
     def download_data(self):
         """
-        Pobiera dane dla zdefiniowanych w słowniku self.sectors sektorów.
+        Pobiera dane dla zdefiniowanych w słowniku self.sectors sektorów
+        (przyrostowo, przez lokalny magazyn notowań, równolegle dla wielu tickerów).
+        Sektory, których nie udało się pobrać, są pomijane.
         """
+        frames, errors = download_many(
+            self.sectors.values(),
+            lambda ticker: self.bar_store.get(ticker, start='2010-01-01').dropna(),
+            max_workers=self.download_workers
+        )
+        for ticker, error in errors.items():
+            print(f"[WARN] Unable to download data for {ticker}: {error}")
+
         self.dataframes = {
-            sector: self.preprocess_data(
-                yf.download(ticker, start='2010-01-01').dropna()
-            )
+            sector: self.preprocess_data(frames[ticker])
             for sector, ticker in self.sectors.items()
+            if ticker in frames and not frames[ticker].empty
         }
 
     def preprocess_data(self, df):
@@ -33,55 +90,114 @@ class StockPrediction:
         df.columns.name = None
         return df
 
-    def compute_rsi(self, series, period=14):
+    def compute_rsi(self, series, period=14, method='simple'):
         """
-        Oblicza wskaźnik RSI.
+        Oblicza wskaźnik RSI (method='simple' - średnie kroczące zysków i strat,
+        'wilder' - wygładzanie Wildera zaczynające się od zwykłej średniej).
         """
         delta = series.diff().fillna(0)
-        gains = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        losses = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        gains = delta.where(delta > 0, 0)
+        losses = -delta.where(delta < 0, 0)
+        if method == 'wilder':
+            gains, losses = _wilder_mean(gains, period), _wilder_mean(losses, period)
+        else:
+            gains, losses = gains.rolling(window=period).mean(), losses.rolling(window=period).mean()
         rs = gains / (losses + 1e-9)
         return 100 - (100 / (1 + rs))
 
+    def compute_features(self, df):
+        """
+        Dodaje do df kolumny ze wskaźnikami (MA, RSI, itp.) i usuwa niepełne wiersze.
+        """
+        df['Rel_Close'] = (df['Close'] / df['Close'].shift(1)) - 1
+        df['MA_50'] = (df['Close'].rolling(window=50).mean() / df['Close'].shift(1)) - 1
+        df['MA_200'] = (df['Close'].rolling(window=200).mean() / df['Close'].shift(1)) - 1
+        df['Daily_Range_%'] = (df['High'] - df['Low']) / df['Low']
+        df['Open_High_%'] = (df['High'] - df['Open']) / df['Open']
+        df['Open_Low_%'] = (df['Open'] - df['Low']) / df['Open']
+        df['RSI'] = self.compute_rsi(df['Close'], method=self.rsi_method)
+        df.dropna(inplace=True)
+
+    def extend_features(self, ticker, df, source_hash):
+        """
+        Dolicza cechy tylko dla słupków dopisanych od ostatniego zapisu - ze stanu
+        IndicatorEngine z magazynu, O(1) na słupek. Zwraca (cechy, daty, stan)
+        albo None, gdy brak stanu lub wcześniejsze notowania się zmieniły.
+        """
+        latest = self.feature_store.load_latest(ticker)
+        if latest is None:
+            return None
+        features, dates, engine = latest
+        if engine.rsi_method != self.rsi_method or engine.last_date is None:
+            return None
+        known = (df['Date'] <= pd.Timestamp(engine.last_date)).to_numpy()
+        if not known.any() or self.feature_store.source_hash(df[known]) != engine.source_hash:
+            return None
+
+        new_features, new_dates = engine.run(df[~known])
+        engine.source_hash = source_hash
+        return (np.concatenate([features, new_features.astype(np.float32)]),
+                np.concatenate([dates, new_dates]), engine)
+
     def preprocess_features(self):
         """
-        Tworzy i dodaje kolumny z dodatkowymi wskaźnikami (MA, RSI, itp.).
-        """
-        for sector, df in self.dataframes.items():
-            df['Rel_Close'] = (df['Close'] / df['Close'].shift(1)) - 1
-            df['MA_50'] = (df['Close'].rolling(window=50).mean() / df['Close'].shift(1)) - 1
-            df['MA_200'] = (df['Close'].rolling(window=200).mean() / df['Close'].shift(1)) - 1
-            df['Daily_Range_%'] = (df['High'] - df['Low']) / df['Low']
-            df['Open_High_%'] = (df['High'] - df['Open']) / df['Open']
-            df['Open_Low_%'] = (df['Open'] - df['Low']) / df['Open']
-            df['RSI'] = self.compute_rsi(df['Close'])
-            df.dropna(inplace=True)
-            self.relative_data[sector] = df[
-                ['Rel_Close', 'MA_50', 'MA_200', 'Daily_Range_%',
-                 'Open_High_%', 'Open_Low_%', 'RSI']
-            ]
+        Przygotowuje cechy dla wszystkich sektorów. Gotowe macierze cech są
+        czytane z magazynu (memmap); po dopisaniu nowych słupków doliczane są
+        tylko nowe wiersze, a od zera - gdy zmieniły się wcześniejsze notowania.
+        """
+        for sector, df in list(self.dataframes.items()):
+            ticker = self.sectors[sector]
+            source_hash = self.feature_store.source_hash(df)
+            cached = self.feature_store.load(ticker, source_hash)
+
+            if cached is None:
+                extended = self.extend_features(ticker, df, source_hash)
+                if extended is None:
+                    # Stan do kontynuacji przy kolejnych odświeżeniach
+                    engine = IndicatorEngine(rsi_method=self.rsi_method)
+                    engine.run(df)
+                    engine.source_hash = source_hash
+                    self.compute_features(df)
+                    features, dates = df[FEATURE_COLUMNS].to_numpy(dtype=np.float32), df['Date'].to_numpy()
+                else:
+                    features, dates, engine = extended
+                try:
+                    self.feature_store.save(ticker, features, dates, source_hash, state=engine)
+                    cached = self.feature_store.load(ticker, source_hash)
+                except OSError as e:
+                    print(f"[WARN] Unable to store features for {ticker}: {e}")
+
+            if cached is not None:
+                features, dates = cached
+            # Surowe dane wyrównujemy do wierszy, dla których istnieją cechy
+            df = df[df['Date'] >= pd.Timestamp(dates[0])]
+            self.dataframes[sector] = df
+
+            self.feature_arrays[sector] = features
+            self.feature_dates[sector] = dates
+            self.relative_data[sector] = pd.DataFrame(features, index=df.index, columns=FEATURE_COLUMNS, copy=False)
 
     def create_lstm_data(self):
         """
         Tworzy sekwencje (okna) do trenowania i testowania modelu LSTM.
         """
-        for sector, data in self.relative_data.items():
+        for sector, data in self.feature_arrays.items():
             train_size = int(len(data) * self.test_split)
-            train_data = data.iloc[:train_size]
-            test_data = data.iloc[train_size:]
+            train_data = data[:train_size]
+            test_data = data[train_size:]
 
-            if len(train_data) > self.window_size and len(test_data) > self.window_size:
+            span = self.window_size + self.horizon - 1
+            if len(train_data) > span and len(test_data) > span:
                 self.lstm_train_data[sector] = self._generate_sequences(train_data)
                 self.lstm_test_data[sector] = self._generate_sequences(test_data)
 
     def _generate_sequences(self, data):
-        X, y = [], []
-        for i in range(len(data) - self.window_size):
-            X.append(data.iloc[i : i + self.window_size].values)
-            y.append(data.iloc[i + self.window_size, 0])
-        return np.array(X), np.array(y)
+        """
+        Okna (X) i cele (y) jako widoki na dane (np. memmap) - bez pętli i kopiowania okien.
+        """
+        return sliding_windows(data, self.window_size, self.horizon)
 
-    def build_model(self, input_shape):
+    def build_model(self, input_shape, outputs=1):
         """
         Buduje nowy model LSTM.
         """
@@ -91,36 +207,398 @@ class StockPrediction:
             LSTM(64, return_sequences=True), Dropout(0.2),
             LSTM(32), Dropout(0.2),
             Dense(64, activation='relu'),
-            Dense(1, activation='linear')
+            Dense(outputs, activation='linear')
         ])
         model.compile(optimizer='adam', loss='mse', metrics=['mae'])
         return model
 
-    def create_or_load_model(self, sector, force_update=False):
+    def backend_for(self, sector):
+        """Backend modelu danego sektora."""
+        if isinstance(self.backend, dict):
+            return self.backend.get(sector, LSTM_BACKEND)
+        return self.backend
+
+    def model_spec(self, sector):
         """
-        Tworzy lub ładuje (jeśli istnieje) gotowy model z dysku dla wskazanego sektora.
+        Opis modelu sektora - wszystko, od czego zależy ważność wytrenowanego
+        artefaktu (klucz w rejestrze modeli).
         """
-        model_path = f"lstm_model_{sector}.keras"
-        train_X, train_y = self.lstm_train_data[sector]
-        test_X, test_y = self.lstm_test_data[sector]
+        train_size = int(len(self.feature_arrays[sector]) * self.test_split)
+        if self.backend_for(sector) == RIDGE:
+            architecture = 'ridge'
+            hyperparameters = {'alpha': self.ridge_alpha, 'test_split': self.test_split}
+        else:
+            architecture = 'lstm-64-64-32'
+            hyperparameters = {'epochs': self.epochs, 'batch_size': self.batch_size, 'test_split': self.test_split}
+        spec = {
+            'ticker': self.sectors[sector],
+            'architecture': architecture,
+            'features': FEATURE_COLUMNS,
+            'feature_version': self.feature_store.version,
+            'window_size': self.window_size,
+            'hyperparameters': hyperparameters,
+            'data_cutoff': str(pd.Timestamp(self.feature_dates[sector][train_size - 1]).date()),
+        }
+        if self.horizon > 1:
+            spec['horizon'] = self.horizon
+        return spec
+
+    def _batches(self, data, shuffle=False):
+        """Paczki okien z macierzy cech: strumień tf.data albo WindowBatches na widokach."""
+        if self.streaming:
+            return window_dataset([data], self.window_size, self.batch_size, shuffle=shuffle, horizon=self.horizon)
+        X, y = sliding_windows(data, self.window_size, self.horizon)
+        return WindowBatches(X, y, self.batch_size, shuffle=shuffle)
+
+    def training_inputs(self, sector):
+        """
+        Dane treningowe i walidacyjne dla model.fit: strumień tf.data
+        (przy self.streaming) albo paczki okien z widoków macierzy cech.
+        """
+        data = self.feature_arrays[sector]
+        train_size = int(len(data) * self.test_split)
+        return self._batches(data[:train_size], shuffle=True), self._batches(data[train_size:])
+
+    def fit_model(self, sector, callbacks=None):
+        """
+        Buduje i trenuje nowy model sektora (bez zapisu).
+        Zwraca (model, opis modelu, metryki treningu).
+        """
+        if self.backend_for(sector) == RIDGE:
+            return self.fit_ridge_model(sector)
+
+        train_X, _ = self.lstm_train_data[sector]
         input_shape = (train_X.shape[1], train_X.shape[2])
+        spec = self.model_spec(sector)
+
+        model = self.build_model(input_shape, self.horizon)
+        train_data, validation_data = self.training_inputs(sector)
+        start = time.time()
+        history = model.fit(train_data,
+                            epochs=self.epochs,
+                            validation_data=validation_data,
+                            callbacks=callbacks)
+        metrics = {
+            'mode': 'full',
+            'train_seconds': time.time() - start,
+            'train_samples': int(len(train_X)),
+            'epochs_completed': len(history.history['loss']),
+            'loss': float(history.history['loss'][-1]),
+            'val_loss': float(history.history['val_loss'][-1]),
+            'val_mae': float(history.history['val_mae'][-1]),
+        }
+        return model, spec, metrics
+
+    def fit_ridge_model(self, sector):
+        """
+        Dopasowuje model ridge sektora (rozwiązanie w postaci zamkniętej, bez epok).
+        Zwraca (model, opis modelu, metryki) jak fit_model.
+        """
+        data = self.feature_arrays[sector]
+        train_size = int(len(data) * self.test_split)
+        train_X, train_y = sliding_windows(data[:train_size], self.window_size, self.horizon)
+        test_X, test_y = sliding_windows(data[train_size:], self.window_size, self.horizon)
+        spec = self.model_spec(sector)
+
+        start = time.time()
+        model = RidgeWindowModel(self.ridge_alpha).fit(train_X, train_y)
+        train_seconds = time.time() - start
+        train_error = model.predict(train_X) - train_y.reshape(len(train_y), -1)
+        val_error = model.predict(test_X) - test_y.reshape(len(test_y), -1)
+        metrics = {
+            'mode': 'full',
+            'train_seconds': train_seconds,
+            'train_samples': int(len(train_X)),
+            'epochs_completed': 1,
+            'loss': float(np.mean(train_error ** 2)),
+            'val_loss': float(np.mean(val_error ** 2)),
+            'val_mae': float(np.mean(np.abs(val_error))),
+        }
+        return model, spec, metrics
+
+    def update_model(self, sector, epochs=2, tolerance=0.05, callbacks=None):
+        """
+        Aktualizacja "na ciepło": dotrenowuje najnowszy model z rejestru przez
+        kilka epok tylko na oknach, których cel (choćby jeden dzień horyzontu)
+        wypada po jego dacie odcięcia.
+        Gdy strata walidacyjna pogorszy się o więcej niż tolerance względem
+        modelu wyjściowego, trenuje model od zera (fit_model).
+        Zwraca (model, opis modelu, metryki) albo None, gdy model jest aktualny.
+        """
+        spec = self.model_spec(sector)
+        entry = self.model_registry.latest(spec)
+        if entry is None or self.backend_for(sector) == RIDGE:
+            # Model ridge dopasowuje się od zera szybciej niż jakiekolwiek dotrenowanie
+            return self.fit_model(sector, callbacks)
+
+        data = self.feature_arrays[sector]
+        train_size = int(len(data) * self.test_split)
+        cutoff = pd.Timestamp(entry['spec']['data_cutoff']).to_datetime64()
+        first_new = max(int(np.searchsorted(self.feature_dates[sector], cutoff, side='right')), self.window_size)
+        if first_new >= train_size:
+            return None
+        # Okna, których ostatni dzień celu jest nowy - przy horizon > 1 także te,
+        # w których nowe są tylko ostatnie dni horyzontu
+        start_row = max(first_new - self.window_size - self.horizon + 1, 0)
+        windows = train_size - start_row - self.window_size - self.horizon + 1
+        if windows <= 0:
+            return None
+
+        model = self.model_registry.load(entry)
+        validation = self._batches(data[train_size:])
+        baseline = float(model.evaluate(validation, verbose=0, return_dict=True)['loss'])
 
-        if os.path.exists(model_path) and not force_update:
-            print(f"[INFO] Loading existing model for {sector}")
-            model = tf.keras.models.load_model(model_path)
+        start = time.time()
+        history = model.fit(self._batches(data[start_row:train_size], shuffle=True),
+                            epochs=epochs,
+                            validation_data=validation,
+                            callbacks=callbacks)
+        val_loss = float(history.history['val_loss'][-1])
+        if val_loss > baseline * (1 + tolerance):
+            print(f"[WARN] Fine-tuning degraded validation loss for {sector} "
+                  f"({baseline:.6f} -> {val_loss:.6f}), retraining from scratch")
+            model, spec, metrics = self.fit_model(sector, callbacks)
+            metrics['mode'] = 'full (fine-tune fallback)'
+            return model, spec, metrics
+
+        metrics = {
+            'mode': 'fine-tune',
+            'base_fingerprint': entry['fingerprint'],
+            'baseline_val_loss': baseline,
+            'train_seconds': time.time() - start,
+            'train_samples': windows,
+            'epochs_completed': len(history.history['loss']),
+            'loss': float(history.history['loss'][-1]),
+            'val_loss': val_loss,
+            'val_mae': float(history.history['val_mae'][-1]),
+        }
+        return model, spec, metrics
+
+    def register_model(self, sector, model, spec, metrics):
+        """Zapisuje wytrenowany model w rejestrze i zwraca jego wpis."""
+        entry = self.model_registry.register(spec, model.save, metrics, artifact=artifact_name(model))
+        self.model_versions[sector] = entry
+        return entry
+
+    def create_or_load_model(self, sector, force_update=False):
+        """
+        Ładuje z rejestru model pasujący do opisu sektora (albo wersję tej samej
+        linii z danymi starszymi najwyżej o max_cutoff_age dni), a gdy go brak
+        albo force_update - trenuje i rejestruje nowy.
+        W trybie shared zwraca model wspólny przypięty do tickera sektora.
+        """
+        if self.shared:
+            model, entry = self.create_or_load_shared_model(force_update)
+            self.model_versions[sector] = entry
+            return self.bind_shared_model(sector, model, entry)
+
+        spec = self.model_spec(sector)
+
+        entry = None
+        if not force_update:
+            entry = self.model_registry.lookup(spec, self.max_cutoff_age)
+
+        if entry is not None:
+            print(f"[INFO] Loading model {entry['fingerprint']} for {sector} "
+                  f"(data up to {entry['spec']['data_cutoff']})")
+            model = self.model_registry.load(entry)
+            self.model_versions[sector] = entry
         else:
             print(f"[INFO] Training new model for {sector}")
-            model = self.build_model(input_shape)
-            model.fit(train_X, train_y,
-                      epochs=self.epochs,
-                      batch_size=self.batch_size,
-                      validation_data=(test_X, test_y))
-            model.save(model_path)
+            model, spec, metrics = self.fit_model(sector)
+            self.register_model(sector, model, spec, metrics)
         return model
 
-    def train_models(self, force_update=False):
+    def shared_model_spec(self):
+        """
+        Opis modelu wspólnego: lista tickerów (kolejność = numery w warstwie
+        zanurzeń) i najpóźniejsza data odcięcia danych treningowych.
+        """
+        sectors = list(self.lstm_train_data.keys())
+        if not sectors:
+            raise ValueError("No sector has enough data for the shared model")
+        architecture = 'lstm-64-64-32'
+        if self.embedding_dim:
+            architecture += f'-embedding{self.embedding_dim}'
+        spec = {
+            'ticker': UNIVERSE,
+            'tickers': sorted({self.sectors[sector] for sector in sectors}),
+            'architecture': architecture,
+            'features': FEATURE_COLUMNS,
+            'feature_version': self.feature_store.version,
+            'window_size': self.window_size,
+            'hyperparameters': {'epochs': self.epochs, 'batch_size': self.batch_size, 'test_split': self.test_split},
+            'data_cutoff': max(self.model_spec(sector)['data_cutoff'] for sector in sectors),
+        }
+        if self.horizon > 1:
+            spec['horizon'] = self.horizon
+        return spec
+
+    def fit_shared_model(self, callbacks=None):
+        """
+        Trenuje jeden model na oknach wszystkich tickerów naraz (strumień tf.data
+        z macierzy cech - pamięć rośnie z liczbą dni, nie z liczbą okien).
+        Zwraca (model, opis modelu, metryki treningu).
+        """
+        spec = self.shared_model_spec()
+        ticker_ids = {ticker: i for i, ticker in enumerate(spec['tickers'])}
+        sectors = list(self.lstm_train_data.keys())
+        train, test, ids = [], [], []
+        for sector in sectors:
+            data = self.feature_arrays[sector]
+            train_size = int(len(data) * self.test_split)
+            train.append(data[:train_size])
+            test.append(data[train_size:])
+            ids.append(ticker_ids[self.sectors[sector]])
+
+        ids = ids if self.embedding_dim else None
+        input_shape = (self.window_size, len(FEATURE_COLUMNS))
+        if self.embedding_dim:
+            model = build_universe_model(input_shape, len(ticker_ids), self.embedding_dim, self.horizon)
+        else:
+            model = self.build_model(input_shape, self.horizon)
+
+        start = time.time()
+        history = model.fit(window_dataset(train, self.window_size, self.batch_size, shuffle=True,
+                                           horizon=self.horizon, ids=ids),
+                            epochs=self.epochs,
+                            validation_data=window_dataset(test, self.window_size, self.batch_size,
+                                                           horizon=self.horizon, ids=ids),
+                            callbacks=callbacks)
+        metrics = {
+            'mode': 'full',
+            'train_seconds': time.time() - start,
+            'tickers': len(ticker_ids),
+            'epochs_completed': len(history.history['loss']),
+            'loss': float(history.history['loss'][-1]),
+            'val_loss': float(history.history['val_loss'][-1]),
+            'val_mae': float(history.history['val_mae'][-1]),
+        }
+        return model, spec, metrics
+
+    def create_or_load_shared_model(self, force_update=False):
+        """
+        Model wspólny: z pamięci, z rejestru (dokładny opis albo wersja linii
+        w granicy max_cutoff_age) albo trenowany i rejestrowany. Zwraca (model, wpis rejestru).
+        """
+        with self._shared_lock:
+            if self.shared_model is not None and not force_update:
+                return self.shared_model, self.shared_entry
+
+            spec = self.shared_model_spec()
+            entry = None
+            if not force_update:
+                entry = self.model_registry.lookup(spec, self.max_cutoff_age)
+
+            if entry is not None:
+                print(f"[INFO] Loading shared model {entry['fingerprint']} for {len(spec['tickers'])} tickers "
+                      f"(data up to {entry['spec']['data_cutoff']})")
+                model = self.model_registry.load(entry)
+            else:
+                print(f"[INFO] Training shared model for {len(spec['tickers'])} tickers")
+                model, spec, metrics = self.fit_shared_model()
+                entry = self.model_registry.register(spec, model.save, metrics)
+
+            self.shared_model, self.shared_entry = model, entry
+            return model, entry
+
+    def bind_shared_model(self, sector, model, entry):
+        """
+        Model wspólny w roli modelu sektora. Bez zanurzeń obsługuje dowolny
+        ticker; z zanurzeniami tylko tickery, na których był trenowany.
+        """
+        if not self.embedding_dim:
+            return model
+        tickers = entry['spec']['tickers']
+        ticker = self.sectors[sector]
+        if ticker not in tickers:
+            raise ValueError(f"Ticker {ticker} is not part of the shared model universe")
+        return TickerBoundModel(model, tickers.index(ticker))
+
+    def worker_config(self):
+        """Parametry konstruktora potrzebne do odtworzenia predyktora w procesie roboczym."""
+        return {
+            'window_size': self.window_size,
+            'test_split': self.test_split,
+            'epochs': self.epochs,
+            'batch_size': self.batch_size,
+            'feature_store': self.feature_store,
+            'model_registry': self.model_registry,
+            'streaming': self.streaming,
+            'backend': self.backend,
+            'ridge_alpha': self.ridge_alpha,
+            'horizon': self.horizon,
+            'shared': self.shared,
+            'embedding_dim': self.embedding_dim,
+            'rsi_method': self.rsi_method,
+            'max_cutoff_age': self.max_cutoff_age,
+        }
+
+    def training_job(self, sector):
+        """Zadanie treningu sektora dla procesu roboczego (train_sectors_in_parallel)."""
+        return {
+            'sector': sector,
+            'ticker': self.sectors[sector],
+            'config': self.worker_config(),
+            'features': np.asarray(self.feature_arrays[sector]),
+            'dates': np.asarray(self.feature_dates[sector]),
+        }
+
+    def train_models(self, force_update=False, parallel=False, max_workers=None,
+                     threads_per_worker=None, progress=None):
         """
         Trenuje (lub ładuje) modele dla wszystkich sektorów.
+
+        Przy parallel=True sektory bez gotowego modelu trenowane są w osobnych
+        procesach (po threads_per_worker wątków każdy). Błąd jednego sektora nie
+        przerywa pozostałych - sektor po prostu nie dostaje modelu.
+        progress(sector, done, total, error) raportuje postęp.
         """
-        for sector in self.lstm_train_data.keys():
-            self.models[sector] = self.create_or_load_model(sector, force_update)
\ No newline at end of file
+        sectors = list(self.lstm_train_data.keys())
+        if self.shared:
+            # Jeden model dla wszystkich sektorów - nie ma czego zrównoleglać
+            parallel = False
+            self.create_or_load_shared_model(force_update)
+            force_update = False
+        pending = []
+        finished = 0
+        for sector in sectors:
+            spec = self.model_spec(sector)
+            has_model = self.model_registry.lookup(spec, self.max_cutoff_age)
+            if parallel and (force_update or not has_model):
+                pending.append(sector)
+                continue
+            try:
+                self.models[sector] = self.create_or_load_model(sector, force_update)
+                error = None
+            except Exception as e:
+                print(f"[ERROR] Unable to train or load the model for {sector}: {e}")
+                error = e
+            finished += 1
+            if progress is not None:
+                progress(sector, finished, len(sectors), error)
+
+        if not pending:
+            return
+
+        jobs = [self.training_job(sector) for sector in pending]
+
+        def report(sector, done, total, error):
+            if progress is not None:
+                progress(sector, finished + done, len(sectors), error)
+
+        entries, errors = train_sectors_in_parallel(jobs, max_workers, threads_per_worker, report)
+        for sector, error in errors.items():
+            print(f"[ERROR] Training failed for {sector}: {error}")
+        for sector, entry in entries.items():
+            self.models[sector] = self.model_registry.load(entry)
+            self.model_versions[sector] = entry
+
+
+def _wilder_mean(values, period):
+    """Średnia Wildera: zwykła średnia z pierwszych 'period' wartości, potem wygładzanie 1/period."""
+    seeded = pd.Series(np.nan, index=values.index)
+    if len(values) >= period:
+        seeded.iloc[period - 1] = values.iloc[:period].mean()
+        seeded.iloc[period:] = values.iloc[period:]
+    return seeded.ewm(alpha=1 / period, adjust=False).mean()
@@ -0,0 +1,50 @@
+from .imports import *
+from .inference import CompiledPredictor
+
+# Katalog (pseudo-ticker) modelu wspólnego w rejestrze modeli
+UNIVERSE = '_universe'
+
+
+def build_universe_model(input_shape, n_tickers, embedding_dim=8, outputs=1):
+    """
+    Model LSTM 64-64-32 dla wielu tickerów naraz. Wejścia: okno cech i numer
+    tickera; wektor zanurzenia tickera jest doklejany do cech każdego dnia okna.
+    """
+    window = Input(shape=input_shape, name='window')
+    ticker = Input(shape=(), dtype='int32', name='ticker')
+    embedding = Embedding(n_tickers, embedding_dim, name='ticker_embedding')(ticker)
+    x = Concatenate()([window, RepeatVector(input_shape[0])(embedding)])
+    x = Dropout(0.2)(LSTM(64, return_sequences=True)(x))
+    x = Dropout(0.2)(LSTM(64, return_sequences=True)(x))
+    x = Dropout(0.2)(LSTM(32)(x))
+    x = Dense(64, activation='relu')(x)
+    output = Dense(outputs, activation='linear')(x)
+
+    model = tf.keras.Model([window, ticker], output)
+    model.compile(optimizer='adam', loss='mse', metrics=['mae'])
+    return model
+
+
+class TickerBoundModel:
+    """
+    Model wspólny przypięty do jednego tickera: predict(okna) z tym samym
+    kontraktem co model sektora, więc strony i narzędzia predykcji działają bez zmian.
+    """
+    def __init__(self, model, ticker_id):
+        self.model = model
+        self.ticker_id = ticker_id
+        self._predictor = CompiledPredictor(model, ticker_id=ticker_id)
+
+    @property
+    def input_shape(self):
+        return self.model.input_shape[0]
+
+    @property
+    def output_shape(self):
+        return self.model.output_shape
+
+    def predict(self, x, **kwargs):
+        return self._predictor.predict(x)
+
+    def latency_stats(self):
+        return self._predictor.latency_stats()
@@ -0,0 +1,54 @@
+from .imports import *
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(values, window_size, horizon=1):
+    """
+    Zwraca okna X o kształcie (n, window_size, cechy) i cele y (kolumna 0
+    dnia następującego po oknie) jako widoki na 'values' - bez kopiowania danych.
+    Przy horizon > 1 y ma kształt (n, horizon): kolumna 0 kolejnych horizon dni po oknie.
+    """
+    values = np.asarray(values)
+    n = len(values) - window_size - horizon + 1
+    if n <= 0:
+        return (np.empty((0, window_size, values.shape[1]), dtype=values.dtype),
+                np.empty((0,) if horizon == 1 else (0, horizon), dtype=values.dtype))
+
+    X = sliding_window_view(values, window_size, axis=0)[:n].transpose(0, 2, 1)
+    if horizon == 1:
+        y = values[window_size:, 0]
+    else:
+        y = sliding_window_view(values[window_size:, 0], horizon)
+    return X, y
+
+
+class WindowBatches(tf.keras.utils.Sequence):
+    """
+    Podaje do model.fit paczki okien; okna są kopiowane do pamięci
+    dopiero w momencie pobrania danej paczki.
+    """
+    def __init__(self, X, y, batch_size=32, shuffle=False, seed=None, **kwargs):
+        super().__init__(**kwargs)
+        self.X = X
+        self.y = y
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.indices = np.arange(len(X))
+        if self.shuffle:
+            self.rng.shuffle(self.indices)
+
+    def __len__(self):
+        return int(np.ceil(len(self.indices) / self.batch_size))
+
+    def __getitem__(self, batch):
+        idx = self.indices[batch * self.batch_size:(batch + 1) * self.batch_size]
+        if not self.shuffle:
+            # Kolejne okna - wystarczy wycinek widoku
+            idx = slice(idx[0], idx[-1] + 1)
+        return (np.ascontiguousarray(self.X[idx], dtype=np.float32),
+                np.ascontiguousarray(self.y[idx], dtype=np.float32))
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self.rng.shuffle(self.indices)
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from market_data import BarStore
+
+
+class FakeProvider:
+    """Dostawca zwracający zadane notowania (albo pusty DataFrame)."""
+    def __init__(self, data):
+        self.data = data
+
+    def history(self, ticker, start=None, end=None, period=None):
+        if self.data.empty:
+            return self.data
+        return self.data[self.data.index >= pd.Timestamp(start)]
+
+
+def make_bars(days):
+    dates = pd.bdate_range('2020-01-01', periods=days, name='Date')
+    close = pd.Series(range(100, 100 + days), index=dates, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': 1000.0})
+
+
+def test_empty_provider_response_keeps_stored_history(tmp_path):
+    bars = make_bars(300)
+    store = BarStore(root=str(tmp_path), provider=FakeProvider(bars), refresh_interval=0)
+    assert len(store.get('AAA', start='2020-01-01')) == 300
+
+    store.provider = FakeProvider(bars.iloc[:0])
+    assert len(store.get('AAA', start='2020-01-01')) == 300
+    assert len(store.load('AAA')) == 300
+
+
+def test_truncated_provider_response_keeps_stored_history(tmp_path):
+    bars = make_bars(300)
+    store = BarStore(root=str(tmp_path), provider=FakeProvider(bars), refresh_interval=0)
+    store.get('AAA', start='2020-01-01')
+
+    store.provider = FakeProvider(bars.iloc[-2:])
+    assert len(store.get('AAA', start='2020-01-01')) == 300
+    assert len(store.load('AAA')) == 300
+
+
+def test_new_bars_are_appended(tmp_path):
+    bars = make_bars(300)
+    store = BarStore(root=str(tmp_path), provider=FakeProvider(bars.iloc[:290]), refresh_interval=0)
+    store.get('AAA', start='2020-01-01')
+
+    store.provider = FakeProvider(bars)
+    pd.testing.assert_frame_equal(store.get('AAA', start='2020-01-01'), bars, check_freq=False)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('tensorflow')
+
+from predictions.stock_prediction import StockPrediction
+
+
+class FakeModel:
+    """Model zapamiętujący okna, na których go dotrenowano."""
+    def __init__(self):
+        self.trained_on = None
+
+    def evaluate(self, data, verbose=0, return_dict=True):
+        return {'loss': 1.0}
+
+    def fit(self, data, epochs=1, validation_data=None, callbacks=None):
+        self.trained_on = data
+        history = {'loss': [0.5] * epochs, 'val_loss': [1.0] * epochs, 'val_mae': [0.5] * epochs}
+        return type('History', (), {'history': history})()
+
+
+class FakeRegistry:
+    """Rejestr z jedną wersją modelu o zadanej dacie odcięcia."""
+    def __init__(self, cutoff, model):
+        self.entry = {'fingerprint': 'base', 'spec': {'data_cutoff': str(cutoff.date())}}
+        self.model = model
+
+    def latest(self, spec):
+        return self.entry
+
+    def load(self, entry):
+        return self.model
+
+
+def make_predictor(rows, cutoff_row, horizon, window_size=10):
+    dates = pd.bdate_range('2020-01-01', periods=rows).to_numpy()
+    features = np.random.default_rng(0).normal(size=(rows, 7)).astype(np.float32)
+    features[:, 0] = np.arange(rows)  # cel = numer wiersza
+    model = FakeModel()
+    predictor = StockPrediction({'Technology': 'AAA'}, window_size=window_size, test_split=0.9, batch_size=8,
+                                horizon=horizon, model_registry=FakeRegistry(pd.Timestamp(dates[cutoff_row]), model))
+    predictor.feature_arrays['Technology'] = features
+    predictor.feature_dates['Technology'] = dates
+    return predictor, model
+
+
+def test_multi_horizon_update_with_few_new_bars():
+    # 300 wierszy, część treningowa 270; model widział dane do wiersza 266 - nowe są 3 słupki
+    predictor, model = make_predictor(rows=300, cutoff_row=266, horizon=5)
+    result = predictor.update_model('Technology', epochs=1)
+
+    assert result is not None
+    assert result[2]['mode'] == 'fine-tune'
+    assert result[2]['train_samples'] == 3
+    targets = model.trained_on.y
+    assert len(targets) == 3
+    # Każde okno ma co najmniej jeden nowy dzień celu i żadnego z części testowej
+    assert (targets.max(axis=1) >= 267).all()
+    assert targets.max() < 270
+
+
+def test_update_without_new_bars_returns_none():
+    predictor, model = make_predictor(rows=300, cutoff_row=269, horizon=5)
+    assert predictor.update_model('Technology', epochs=1) is None
+    assert model.trained_on is None